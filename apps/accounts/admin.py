@@ -9,6 +9,20 @@ from .models import EmailVerificationToken, PasswordResetToken
 User = get_user_model()
 
 
+class ChangeListOnlyMixin:
+    """Restrict changelist queries to the columns named in `list_only`"""
+    
+    list_only = None
+    
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Change forms need every field, so only narrow the changelist
+        match = request.resolver_match
+        if self.list_only and match and match.url_name.endswith('_changelist'):
+            queryset = queryset.only(*self.list_only)
+        return queryset
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     """Admin configuration for User model"""
@@ -36,20 +50,28 @@ class UserAdmin(BaseUserAdmin):
 
 
 @admin.register(EmailVerificationToken)
-class EmailVerificationTokenAdmin(admin.ModelAdmin):
+class EmailVerificationTokenAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     """Admin configuration for EmailVerificationToken model"""
     
-    list_display = ('user', 'token', 'is_used', 'expires_at', 'created_at')
+    list_display = ('user', 'token_hash', 'is_used', 'expires_at', 'created_at')
     list_filter = ('is_used', 'created_at')
-    search_fields = ('user__email', 'token')
-    readonly_fields = ('token', 'created_at')
+    search_fields = ('user__email',)
+    readonly_fields = ('token_hash', 'created_at')
+    raw_id_fields = ('user',)
+    list_select_related = ('user',)
+    list_only = ('id', 'token_hash', 'is_used', 'expires_at', 'created_at', 'user__email')
+    show_full_result_count = False
 
 
 @admin.register(PasswordResetToken)
-class PasswordResetTokenAdmin(admin.ModelAdmin):
+class PasswordResetTokenAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     """Admin configuration for PasswordResetToken model"""
     
-    list_display = ('user', 'token', 'is_used', 'expires_at', 'created_at')
+    list_display = ('user', 'token_hash', 'is_used', 'expires_at', 'created_at')
     list_filter = ('is_used', 'created_at')
-    search_fields = ('user__email', 'token')
-    readonly_fields = ('token', 'created_at')
+    search_fields = ('user__email',)
+    readonly_fields = ('token_hash', 'created_at')
+    raw_id_fields = ('user',)
+    list_select_related = ('user',)
+    list_only = ('id', 'token_hash', 'is_used', 'expires_at', 'created_at', 'user__email')
+    show_full_result_count = False
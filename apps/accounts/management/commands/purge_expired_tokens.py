@@ -0,0 +1,33 @@
+"""
+Django management command to purge expired verification and reset tokens
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.accounts.models import EmailVerificationToken, PasswordResetToken
+
+
+class Command(BaseCommand):
+    help = 'Delete email verification and password reset tokens that expired more than N days ago'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Keep tokens that expired within this many days (default: 7)',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+
+        for model in (EmailVerificationToken, PasswordResetToken):
+            queryset = model.objects.filter(expires_at__lt=cutoff)
+            # Nothing references token rows and no signals are attached, so
+            # skip the deletion collector and issue a single DELETE
+            deleted = queryset._raw_delete(queryset.db)
+            self.stdout.write(
+                self.style.SUCCESS(f'Deleted {deleted} expired {model._meta.verbose_name_plural}')
+            )
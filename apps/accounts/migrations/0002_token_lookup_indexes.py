@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-15 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailverificationtoken',
+            index=models.Index(fields=['token', 'is_used'], name='evt_token_used_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailverificationtoken',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['expires_at'], name='evt_active_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['token', 'is_used'], name='prt_token_used_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['expires_at'], name='prt_active_exp_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_token_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('phone_number', ''), _negated=True), fields=['phone_number'], name='user_phone_nonempty_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_phone_nonempty_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailverificationtoken',
+            name='token',
+            field=models.CharField(db_index=True, max_length=64, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='passwordresettoken',
+            name='token',
+            field=models.CharField(db_index=True, max_length=64, unique=True),
+        ),
+    ]
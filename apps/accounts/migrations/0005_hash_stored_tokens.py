@@ -0,0 +1,69 @@
+# Generated by Django 4.2.7 on 2026-10-15 10:30
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_tokens(apps, schema_editor):
+    """Replace plaintext tokens with their SHA-256 digest"""
+    for model_name in ('EmailVerificationToken', 'PasswordResetToken'):
+        model = apps.get_model('accounts', model_name)
+        for token in model.objects.only('id', 'token').iterator():
+            token.token_hash = hashlib.sha256(token.token.encode()).hexdigest()
+            token.save(update_fields=['token_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_token_max_length'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailverificationtoken',
+            name='evt_token_used_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='passwordresettoken',
+            name='prt_token_used_idx',
+        ),
+        migrations.AddField(
+            model_name='emailverificationtoken',
+            name='token_hash',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='passwordresettoken',
+            name='token_hash',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.RunPython(hash_existing_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='emailverificationtoken',
+            name='token_hash',
+            field=models.CharField(db_index=True, max_length=64, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='passwordresettoken',
+            name='token_hash',
+            field=models.CharField(db_index=True, max_length=64, unique=True),
+        ),
+        migrations.RemoveField(
+            model_name='emailverificationtoken',
+            name='token',
+        ),
+        migrations.RemoveField(
+            model_name='passwordresettoken',
+            name='token',
+        ),
+        migrations.AddIndex(
+            model_name='emailverificationtoken',
+            index=models.Index(fields=['token_hash', 'is_used'], name='evt_hash_used_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['token_hash', 'is_used'], name='prt_hash_used_idx'),
+        ),
+    ]
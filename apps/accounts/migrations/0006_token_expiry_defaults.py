@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-15 12:00
+
+import apps.accounts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_hash_stored_tokens'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailverificationtoken',
+            name='expires_at',
+            field=models.DateTimeField(default=apps.accounts.models.verification_token_expiry),
+        ),
+        migrations.AlterField(
+            model_name='passwordresettoken',
+            name='expires_at',
+            field=models.DateTimeField(default=apps.accounts.models.password_reset_token_expiry),
+        ),
+    ]
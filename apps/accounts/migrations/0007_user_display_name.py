@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-15 14:20
+
+from django.db import migrations, models
+
+
+def backfill_display_name(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    Profile = apps.get_model('profiles', 'Profile')
+    User.objects.filter(profile__isnull=False).update(
+        display_name=models.Subquery(
+            Profile.objects.filter(user=models.OuterRef('pk')).values('display_name')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_token_expiry_defaults'),
+        ('profiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='display_name',
+            field=models.CharField(blank=True, max_length=150),
+        ),
+        migrations.RunPython(backfill_display_name, migrations.RunPython.noop),
+    ]
@@ -1,23 +1,54 @@
 """
 User authentication models for SkillMatchHub
 """
+import hashlib
+import re
+import secrets
+from datetime import timedelta
+
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Now
 from django.utils import timezone
 
 
+def hash_token(raw_token):
+    """Return the digest stored in place of a raw emailed token"""
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+def verification_token_expiry():
+    """Default expiry for email verification tokens"""
+    return timezone.now() + timedelta(hours=24)
+
+
+def password_reset_token_expiry():
+    """Default expiry for password reset tokens"""
+    return timezone.now() + timedelta(hours=1)
+
+
 class UserManager(BaseUserManager):
     """Custom user manager for email-based authentication"""
     
+    @classmethod
+    def normalize_phone_number(cls, phone_number):
+        """Strip whitespace and common separators so lookups hit the index"""
+        if not phone_number:
+            return ''
+        return re.sub(r'[\s\-().]', '', phone_number)
+    
     def create_user(self, email, password=None, **extra_fields):
         """Create and save a regular user with the given email and password"""
         if not email:
             raise ValueError('Users must have an email address')
         
         email = self.normalize_email(email)
+        if 'phone_number' in extra_fields:
+            extra_fields['phone_number'] = self.normalize_phone_number(extra_fields['phone_number'])
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
-        user.save(using=self._db)
+        user.save(using=self._db, force_insert=True)
         return user
     
     def create_superuser(self, email, password=None, **extra_fields):
@@ -46,6 +77,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     first_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, blank=True)
     phone_number = models.CharField(max_length=20, blank=True)
+    # Copy of profile.display_name (kept in step by a profiles signal) so
+    # listings that show users by name don't need to join profiles
+    display_name = models.CharField(max_length=150, blank=True)
     user_type = models.CharField(max_length=20, choices=USER_TYPE_CHOICES, default='job_seeker')
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
@@ -64,6 +98,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         # Note: Removed ordering due to djongo/MongoDB limitations with ORDER BY
+        indexes = [
+            # Phone is optional, so only index rows that actually have one
+            models.Index(fields=['phone_number'], condition=~Q(phone_number=''), name='user_phone_nonempty_idx'),
+        ]
     
     def __str__(self):
         return self.email
@@ -86,18 +124,34 @@ class User(AbstractBaseUser, PermissionsMixin):
         return self.user_type == 'job_seeker'
 
 
+class TokenQuerySet(models.QuerySet):
+    """QuerySet shared by the one-time token models"""
+    
+    def valid(self):
+        """Unused tokens that have not expired, evaluated by the database"""
+        return self.filter(is_used=False, expires_at__gt=Now())
+
+
 class EmailVerificationToken(models.Model):
     """Model to handle email verification tokens"""
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='verification_tokens')
-    token = models.CharField(max_length=255, unique=True, db_index=True)
+    # Only the SHA-256 digest is stored; the raw token is sent by email
+    token_hash = models.CharField(max_length=64, unique=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(default=verification_token_expiry)
     is_used = models.BooleanField(default=False)
     
+    objects = TokenQuerySet.as_manager()
+    
     class Meta:
         db_table = 'email_verification_tokens'
         # Note: Removed ordering due to djongo/MongoDB limitations with ORDER BY
+        indexes = [
+            models.Index(fields=['token_hash', 'is_used'], name='evt_hash_used_idx'),
+            # Partial index: only unused tokens are ever looked up for validity
+            models.Index(fields=['expires_at'], condition=Q(is_used=False), name='evt_active_exp_idx'),
+        ]
     
     def __str__(self):
         return f"Token for {self.user.email}"
@@ -105,20 +159,49 @@ class EmailVerificationToken(models.Model):
     def is_valid(self):
         """Check if token is still valid"""
         return not self.is_used and timezone.now() < self.expires_at
+    
+    @classmethod
+    def bulk_issue(cls, users, lifetime=timedelta(hours=24)):
+        """
+        Issue verification tokens for many users using batched INSERTs.
+        
+        Returns a list of (user, raw_token) pairs; the raw tokens are not
+        stored and must be emailed from here.
+        """
+        expires_at = timezone.now() + lifetime
+        issued = [(user, secrets.token_hex(32)) for user in users]
+        cls.objects.bulk_create(
+            [cls(user=user, token_hash=hash_token(raw), expires_at=expires_at) for user, raw in issued],
+            batch_size=500
+        )
+        return issued
+
+
+def issue_verification_token(user, lifetime=timedelta(hours=24)):
+    """Issue a single verification token for user and return the raw token"""
+    return EmailVerificationToken.bulk_issue([user], lifetime=lifetime)[0][1]
 
 
 class PasswordResetToken(models.Model):
     """Model to handle password reset tokens"""
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='password_reset_tokens')
-    token = models.CharField(max_length=255, unique=True, db_index=True)
+    # Only the SHA-256 digest is stored; the raw token is sent by email
+    token_hash = models.CharField(max_length=64, unique=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(default=password_reset_token_expiry)
     is_used = models.BooleanField(default=False)
     
+    objects = TokenQuerySet.as_manager()
+    
     class Meta:
         db_table = 'password_reset_tokens'
         # Note: Removed ordering due to djongo/MongoDB limitations with ORDER BY
+        indexes = [
+            models.Index(fields=['token_hash', 'is_used'], name='prt_hash_used_idx'),
+            # Partial index: only unused tokens are ever looked up for validity
+            models.Index(fields=['expires_at'], condition=Q(is_used=False), name='prt_active_exp_idx'),
+        ]
     
     def __str__(self):
         return f"Password reset for {self.user.email}"
@@ -3,6 +3,7 @@ Serializers for user authentication
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from django.contrib.auth.password_validation import validate_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
@@ -15,17 +16,20 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
         
-        # Add user data to response
+        # Add user data to response. self.user was loaded by authenticate(),
+        # so build the dict from the instance rather than querying again
+        user = self.user
+        user_type = user.user_type
         data['user'] = {
-            'id': self.user.id,
-            'email': self.user.email,
-            'first_name': self.user.first_name,
-            'last_name': self.user.last_name,
-            'full_name': self.user.full_name,
-            'phone_number': self.user.phone_number,
-            'user_type': self.user.user_type,
-            'is_employer': self.user.is_employer,
-            'is_email_verified': self.user.is_email_verified,
+            'id': user.id,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'full_name': user.full_name,
+            'phone_number': user.phone_number,
+            'user_type': user_type,
+            'is_employer': user_type == 'employer',
+            'is_email_verified': user.is_email_verified,
         }
         
         return data
@@ -40,6 +44,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('email', 'first_name', 'last_name', 'phone_number', 'password', 'password_confirm', 'user_type')
+        # Uniqueness is enforced by the unique index on insert (see create)
+        # instead of a SELECT before every registration
+        extra_kwargs = {'email': {'validators': []}}
     
     def validate(self, attrs):
         """Validate that passwords match"""
@@ -50,14 +57,18 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Create a new user"""
         validated_data.pop('password_confirm')
-        user = User.objects.create_user(
-            email=validated_data['email'],
-            password=validated_data['password'],
-            first_name=validated_data.get('first_name', ''),
-            last_name=validated_data.get('last_name', ''),
-            phone_number=validated_data.get('phone_number', ''),
-            user_type=validated_data.get('user_type', 'job_seeker'),
-        )
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    email=validated_data['email'],
+                    password=validated_data['password'],
+                    first_name=validated_data.get('first_name', ''),
+                    last_name=validated_data.get('last_name', ''),
+                    phone_number=validated_data.get('phone_number', ''),
+                    user_type=validated_data.get('user_type', 'job_seeker'),
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({'email': 'A user with this email already exists.'})
         return user
 
 
@@ -71,6 +82,10 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'email', 'first_name', 'last_name', 'full_name', 'phone_number', 'user_type', 'is_employer', 'is_email_verified', 'created_at', 'last_login')
         read_only_fields = ('id', 'created_at', 'last_login', 'is_email_verified')
+    
+    def validate_phone_number(self, value):
+        """Store phone numbers in canonical form"""
+        return User.objects.normalize_phone_number(value)
 
 
 class PasswordChangeSerializer(serializers.Serializer):
@@ -0,0 +1,24 @@
+"""
+Celery tasks for accounts
+"""
+import secrets
+
+from celery import shared_task
+from django.core.management import call_command
+
+from apps.notifications.tasks import send_password_reset_email
+from .models import PasswordResetToken, hash_token
+
+
+@shared_task
+def create_password_reset_token(user_id):
+    """Issue a password reset token for user_id and email it"""
+    token = secrets.token_hex(32)
+    PasswordResetToken.objects.create(user_id=user_id, token_hash=hash_token(token))
+    return send_password_reset_email(user_id, token)
+
+
+@shared_task
+def purge_expired_tokens():
+    """Nightly cleanup of expired verification and password reset tokens"""
+    call_command('purge_expired_tokens')
@@ -2,13 +2,27 @@
 Tests for accounts app
 """
 import pytest
+from datetime import timedelta
+from io import StringIO
 from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
+from apps.accounts.models import EmailVerificationToken, PasswordResetToken, hash_token
 
 User = get_user_model()
 
 
+class FailingEmailBackend(BaseEmailBackend):
+    """Email backend whose sends always fail, like an unreachable SMTP server"""
+    
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError('SMTP server unavailable')
+
+
 @pytest.mark.django_db
 class TestUserRegistration:
     """Test user registration"""
@@ -55,6 +69,21 @@ class TestUserRegistration:
         response = client.post('/api/auth/register/', data)
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_register_duplicate_email(self, job_seeker_user):
+        """Test registration with an email that is already taken"""
+        client = APIClient()
+        data = {
+            'email': 'jobseeker@example.com',
+            'password': 'testpass123',
+            'password_confirm': 'testpass123',
+            'user_type': 'job_seeker'
+        }
+        response = client.post('/api/auth/register/', data)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'email' in response.data
+        assert User.objects.filter(email='jobseeker@example.com').count() == 1
 
 
 @pytest.mark.django_db
@@ -73,6 +102,8 @@ class TestAuthentication:
         assert response.status_code == status.HTTP_200_OK
         assert 'access' in response.data
         assert 'refresh' in response.data
+        assert response.data['user']['email'] == 'jobseeker@example.com'
+        assert response.data['user']['is_employer'] is False
     
     def test_login_invalid_credentials(self):
         """Test login with invalid credentials"""
@@ -84,3 +115,216 @@ class TestAuthentication:
         response = client.post('/api/auth/token/', data)
         
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestEmailVerification:
+    """Test email verification tokens"""
+    
+    def test_registration_issues_token(self):
+        """Test that registering creates a verification token"""
+        client = APIClient()
+        data = {
+            'email': 'verifyme@example.com',
+            'password': 'testpass123',
+            'password_confirm': 'testpass123',
+            'user_type': 'job_seeker'
+        }
+        client.post('/api/auth/register/', data)
+        
+        token = EmailVerificationToken.objects.get(user__email='verifyme@example.com')
+        assert len(token.token_hash) == 64
+        assert token.is_valid()
+    
+    def test_bulk_issue(self, job_seeker_user, employer_user):
+        """Test issuing tokens for several users at once"""
+        issued = EmailVerificationToken.bulk_issue([job_seeker_user, employer_user])
+        
+        assert [user for user, _ in issued] == [job_seeker_user, employer_user]
+        for user, raw_token in issued:
+            token = EmailVerificationToken.objects.get(user=user)
+            assert token.token_hash == hash_token(raw_token)
+    
+    def test_verify_email_success(self, job_seeker_user):
+        """Test verifying email with a valid token"""
+        EmailVerificationToken.objects.create(
+            user=job_seeker_user,
+            token_hash=hash_token('valid-token'),
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+        client = APIClient()
+        response = client.post('/api/auth/verify-email/', {'token': 'valid-token'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        job_seeker_user.refresh_from_db()
+        assert job_seeker_user.is_email_verified
+        assert EmailVerificationToken.objects.get(token_hash=hash_token('valid-token')).is_used
+    
+    def test_verify_email_expired_token(self, job_seeker_user):
+        """Test verifying email with an expired token"""
+        EmailVerificationToken.objects.create(
+            user=job_seeker_user,
+            token_hash=hash_token('expired-token'),
+            expires_at=timezone.now() - timedelta(hours=1)
+        )
+        client = APIClient()
+        response = client.post('/api/auth/verify-email/', {'token': 'expired-token'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        job_seeker_user.refresh_from_db()
+        assert not job_seeker_user.is_email_verified
+    
+    def test_verify_email_used_token(self, job_seeker_user):
+        """Test that a token cannot be used twice"""
+        EmailVerificationToken.objects.create(
+            user=job_seeker_user,
+            token_hash=hash_token('used-token'),
+            expires_at=timezone.now() + timedelta(hours=24),
+            is_used=True
+        )
+        client = APIClient()
+        response = client.post('/api/auth/verify-email/', {'token': 'used-token'})
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestPasswordResetConfirm:
+    """Test password reset confirmation"""
+    
+    def test_reset_password_success(self, job_seeker_user):
+        """Test resetting password with a valid token"""
+        PasswordResetToken.objects.create(
+            user=job_seeker_user,
+            token_hash=hash_token('reset-token'),
+            expires_at=timezone.now() + timedelta(hours=1)
+        )
+        client = APIClient()
+        data = {
+            'token': 'reset-token',
+            'password': 'newSecurePass456',
+            'password_confirm': 'newSecurePass456'
+        }
+        response = client.post('/api/auth/password/reset/confirm/', data)
+        
+        assert response.status_code == status.HTTP_200_OK
+        job_seeker_user.refresh_from_db()
+        assert job_seeker_user.check_password('newSecurePass456')
+        
+        # The token is single-use
+        response = client.post('/api/auth/password/reset/confirm/', data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestSimplePasswordReset:
+    """Test the simple email/phone password reset flow"""
+    
+    def test_check_by_phone_number_normalizes_input(self):
+        """Test that formatting differences don't prevent a phone lookup"""
+        user = User.objects.create_user(
+            email='phone@example.com',
+            password='testpass123',
+            phone_number='+1 (555) 123-4567'
+        )
+        assert user.phone_number == '+15551234567'
+        
+        client = APIClient()
+        response = client.post('/api/auth/password/reset/check/', {'phone_number': '+1 555 123 4567'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['user_id'] == user.id
+    
+    def test_simple_reset_by_email(self, job_seeker_user):
+        """Test resetting the password directly by email"""
+        client = APIClient()
+        data = {
+            'email': 'jobseeker@example.com',
+            'new_password': 'anotherPass789',
+            'new_password_confirm': 'anotherPass789'
+        }
+        response = client.post('/api/auth/password/reset/simple/', data)
+        
+        assert response.status_code == status.HTTP_200_OK
+        job_seeker_user.refresh_from_db()
+        assert job_seeker_user.check_password('anotherPass789')
+
+
+@pytest.mark.django_db
+class TestPurgeExpiredTokens:
+    """Test the purge_expired_tokens management command"""
+    
+    def test_purge_expired_tokens(self, job_seeker_user):
+        """Test that only long-expired tokens are deleted"""
+        EmailVerificationToken.objects.create(
+            user=job_seeker_user,
+            token_hash=hash_token('old-token'),
+            expires_at=timezone.now() - timedelta(days=30)
+        )
+        EmailVerificationToken.objects.create(
+            user=job_seeker_user,
+            token_hash=hash_token('recent-token'),
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+        PasswordResetToken.objects.create(
+            user=job_seeker_user,
+            token_hash=hash_token('old-reset-token'),
+            expires_at=timezone.now() - timedelta(days=30)
+        )
+        
+        call_command('purge_expired_tokens', stdout=StringIO())
+        
+        assert list(EmailVerificationToken.objects.values_list('token_hash', flat=True)) == [hash_token('recent-token')]
+        assert not PasswordResetToken.objects.exists()
+        assert len(mail.outbox) == 0
+
+
+@pytest.mark.django_db
+class TestPasswordResetRequest:
+    """Test requesting a password reset"""
+    
+    def test_request_issues_token_for_existing_email(self, job_seeker_user):
+        """Test a reset token is issued for a known email"""
+        client = APIClient()
+        response = client.post('/api/auth/password/reset/', {'email': job_seeker_user.email})
+        
+        assert response.status_code == status.HTTP_200_OK
+        reset_token = PasswordResetToken.objects.get(user=job_seeker_user)
+        assert reset_token.expires_at <= timezone.now() + timedelta(hours=1)
+        assert reset_token.is_valid()
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [job_seeker_user.email]
+    
+    def test_request_hides_send_failures(self, job_seeker_user, settings):
+        """Test a failed reset email gets the same response as an unknown email"""
+        settings.EMAIL_BACKEND = 'apps.accounts.tests.FailingEmailBackend'
+        client = APIClient()
+        response = client.post('/api/auth/password/reset/', {'email': job_seeker_user.email})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['message'] == 'If the email exists, a password reset link has been sent.'
+    
+    def test_request_unknown_email(self):
+        """Test unknown emails get the same response and no token"""
+        client = APIClient()
+        response = client.post('/api/auth/password/reset/', {'email': 'nobody@example.com'})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert not PasswordResetToken.objects.exists()
+        assert len(mail.outbox) == 0
+
+
+@pytest.mark.django_db
+class TestUserDisplayName:
+    """Test the display name copied from the profile"""
+    
+    def test_display_name_follows_profile(self, job_seeker_user):
+        """Test user.display_name is set on signup and kept in step with the profile"""
+        assert job_seeker_user.display_name == 'jobseeker'
+        
+        profile = job_seeker_user.profile
+        profile.display_name = 'Jane Seeker'
+        profile.save()
+        
+        assert job_seeker_user.display_name == 'Jane Seeker'
+        assert User.objects.get(pk=job_seeker_user.pk).display_name == 'Jane Seeker'
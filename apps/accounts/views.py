@@ -1,17 +1,23 @@
 """
 Views for user authentication
+
+Lookups that only need a few columns use values()/values_list() or only()
+rather than materializing full User instances.
 """
+import logging
+
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.utils import timezone
-from datetime import timedelta
-import secrets
 
-from .models import EmailVerificationToken, PasswordResetToken
+from .models import EmailVerificationToken, PasswordResetToken, hash_token, issue_verification_token
+from .tasks import create_password_reset_token
 from .serializers import (
     CustomTokenObtainPairSerializer,
     UserRegistrationSerializer,
@@ -23,6 +29,7 @@ from .serializers import (
 )
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -41,15 +48,12 @@ class UserRegistrationView(generics.CreateAPIView):
         """Create a new user and send verification email"""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
         
-        # Create email verification token
-        token = secrets.token_urlsafe(32)
-        EmailVerificationToken.objects.create(
-            user=user,
-            token=token,
-            expires_at=timezone.now() + timedelta(hours=24)
-        )
+        # User and verification token are committed together, so a user
+        # is never left without a token
+        with transaction.atomic():
+            user = serializer.save()
+            token = issue_verification_token(user)
         
         # TODO: Send verification email via Celery task
         # from apps.notifications.tasks import send_verification_email
@@ -76,31 +80,29 @@ class EmailVerificationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            verification = EmailVerificationToken.objects.get(token=token)
+        token_hash = hash_token(token)
+        
+        with transaction.atomic():
+            # Consume the token with a single conditional UPDATE; a zero row
+            # count means it was unknown, already used or expired
+            consumed = EmailVerificationToken.objects.valid().filter(
+                token_hash=token_hash
+            ).update(is_used=True)
             
-            if not verification.is_valid():
+            if not consumed:
                 return Response(
                     {'error': 'Token is invalid or expired'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            user = verification.user
-            user.is_email_verified = True
-            user.save()
-            
-            verification.is_used = True
-            verification.save()
-            
-            return Response({
-                'message': 'Email verified successfully'
-            }, status=status.HTTP_200_OK)
-            
-        except EmailVerificationToken.DoesNotExist:
-            return Response(
-                {'error': 'Invalid token'},
-                status=status.HTTP_400_BAD_REQUEST
+            User.objects.filter(verification_tokens__token_hash=token_hash).update(
+                is_email_verified=True,
+                updated_at=timezone.now()
             )
+        
+        return Response({
+            'message': 'Email verified successfully'
+        }, status=status.HTTP_200_OK)
 
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
@@ -126,7 +128,7 @@ class PasswordChangeView(APIView):
         if serializer.is_valid():
             user = request.user
             user.set_password(serializer.validated_data['new_password'])
-            user.save()
+            user.save(update_fields=['password', 'updated_at'])
             
             return Response({
                 'message': 'Password changed successfully'
@@ -147,24 +149,21 @@ class PasswordResetRequestView(APIView):
         if serializer.is_valid():
             email = serializer.validated_data['email']
             
-            try:
-                user = User.objects.get(email=email)
-                
-                # Create password reset token
-                token = secrets.token_urlsafe(32)
-                PasswordResetToken.objects.create(
-                    user=user,
-                    token=token,
-                    expires_at=timezone.now() + timedelta(hours=1)
-                )
-                
-                # TODO: Send password reset email via Celery task
-                # from apps.notifications.tasks import send_password_reset_email
-                # send_password_reset_email.delay(user.id, token)
-                
-            except User.DoesNotExist:
-                # Don't reveal if email exists or not
-                pass
+            user_id = User.objects.filter(email=email).values_list('id', flat=True).first()
+            
+            # Don't reveal if email exists or not
+            if user_id is not None:
+                # Token INSERT and email leave the request path once a
+                # Celery broker is configured
+                if getattr(settings, 'CELERY_BROKER_URL', None):
+                    create_password_reset_token.delay(user_id)
+                else:
+                    # A failed send must not change the response, or it would
+                    # tell the caller which emails are registered
+                    try:
+                        create_password_reset_token(user_id)
+                    except Exception:
+                        logger.exception('Password reset email for user %s failed', user_id)
             
             return Response({
                 'message': 'If the email exists, a password reset link has been sent.'
@@ -183,33 +182,30 @@ class PasswordResetConfirmView(APIView):
         serializer = PasswordResetConfirmSerializer(data=request.data)
         
         if serializer.is_valid():
-            token = serializer.validated_data['token']
+            token_hash = hash_token(serializer.validated_data['token'])
             
-            try:
-                reset_token = PasswordResetToken.objects.get(token=token)
+            with transaction.atomic():
+                consumed = PasswordResetToken.objects.valid().filter(
+                    token_hash=token_hash
+                ).update(is_used=True)
                 
-                if not reset_token.is_valid():
+                if not consumed:
                     return Response(
                         {'error': 'Token is invalid or expired'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                user = reset_token.user
+                # set_password hashes in Python, so load just enough of the row
+                user = User.objects.only('id', 'password').get(password_reset_tokens__token_hash=token_hash)
                 user.set_password(serializer.validated_data['password'])
-                user.save()
-                
-                reset_token.is_used = True
-                reset_token.save()
-                
-                return Response({
-                    'message': 'Password reset successfully'
-                }, status=status.HTTP_200_OK)
-                
-            except PasswordResetToken.DoesNotExist:
-                return Response(
-                    {'error': 'Invalid token'},
-                    status=status.HTTP_400_BAD_REQUEST
+                User.objects.filter(pk=user.pk).update(
+                    password=user.password,
+                    updated_at=timezone.now()
                 )
+            
+            return Response({
+                'message': 'Password reset successfully'
+            }, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -230,17 +226,19 @@ class SimplePasswordResetCheckView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Only id and email are returned, so skip building a User instance
         user = None
         if email:
-            user = User.objects.filter(email=email).first()
+            user = User.objects.filter(email=email).values('id', 'email').first()
         elif phone_number:
-            user = User.objects.filter(phone_number=phone_number).first()
+            phone_number = User.objects.normalize_phone_number(phone_number)
+            user = User.objects.filter(phone_number=phone_number).values('id', 'email').first()
         
         if user:
             return Response({
                 'exists': True,
-                'user_id': user.id,
-                'email': user.email,
+                'user_id': user['id'],
+                'email': user['email'],
                 'message': 'Account found. You can now reset your password.'
             }, status=status.HTTP_200_OK)
         
@@ -264,11 +262,13 @@ class SimplePasswordResetView(APIView):
             phone_number = serializer.validated_data.get('phone_number')
             new_password = serializer.validated_data['new_password']
             
+            # set_password needs an instance, but only the password column
             user = None
             if email:
-                user = User.objects.filter(email=email).first()
+                user = User.objects.filter(email=email).only('id', 'password').first()
             elif phone_number:
-                user = User.objects.filter(phone_number=phone_number).first()
+                phone_number = User.objects.normalize_phone_number(phone_number)
+                user = User.objects.filter(phone_number=phone_number).only('id', 'password').first()
             
             if not user:
                 return Response(
@@ -277,7 +277,7 @@ class SimplePasswordResetView(APIView):
                 )
             
             user.set_password(new_password)
-            user.save()
+            user.save(update_fields=['password', 'updated_at'])
             
             return Response({
                 'message': 'Password reset successfully. You can now login with your new password.'
@@ -2,6 +2,10 @@
 Admin configuration for jobs app
 """
 from django.contrib import admin
+from django.contrib.admin import DateFieldListFilter
+from apps.accounts.admin import ChangeListOnlyMixin
+from apps.matching.services import score_and_save_applications
+from .caching import bump_job_cache_version
 from .models import Job, JobSkill, Application, SavedJob
 
 
@@ -12,14 +16,19 @@ class JobSkillInline(admin.TabularInline):
 
 
 @admin.register(Job)
-class JobAdmin(admin.ModelAdmin):
+class JobAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     """Admin configuration for Job model"""
     
     list_display = ('title', 'employer', 'employment_type', 'status', 'applications_count', 'created_at')
-    list_filter = ('status', 'employment_type', 'experience_level', 'is_remote', 'created_at')
+    # created_at is indexed on its own and together with status
+    list_filter = ('status', 'employment_type', 'experience_level', 'is_remote', ('created_at', DateFieldListFilter))
     search_fields = ('title', 'description', 'employer__email')
     readonly_fields = ('views_count', 'applications_count', 'created_at', 'updated_at')
     inlines = [JobSkillInline]
+    raw_id_fields = ('employer',)
+    list_select_related = ('employer',)
+    list_only = ('id', 'title', 'employment_type', 'status', 'applications_count', 'created_at', 'employer__email')
+    show_full_result_count = False
     
     fieldsets = (
         ('Basic Information', {
@@ -39,16 +48,31 @@ class JobAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    def save_related(self, request, form, formsets, change):
+        """Refresh the skill totals after the inline job skills are saved or deleted"""
+        super().save_related(request, form, formsets, change)
+        form.instance.refresh_skill_totals()
+        bump_job_cache_version()
 
 
 @admin.register(Application)
-class ApplicationAdmin(admin.ModelAdmin):
+class ApplicationAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     """Admin configuration for Application model"""
     
     list_display = ('applicant', 'job', 'status', 'match_score', 'applied_at')
-    list_filter = ('status', 'applied_at')
+    list_filter = ('status', ('applied_at', DateFieldListFilter))
     search_fields = ('applicant__email', 'job__title')
     readonly_fields = ('match_score', 'applied_at', 'updated_at')
+    raw_id_fields = ('job', 'applicant')
+    # Job.__str__ reads the employer's company name
+    list_select_related = ('applicant', 'job', 'job__employer', 'job__employer__profile')
+    list_only = (
+        'id', 'status', 'match_score', 'applied_at', 'applicant__email',
+        'job__title', 'job__employer__profile__company_name',
+    )
+    show_full_result_count = False
+    actions = ['recalculate_match_scores']
     
     fieldsets = (
         ('Application Details', {
@@ -62,13 +86,25 @@ class ApplicationAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+    
+    @admin.action(description='Recalculate match scores')
+    def recalculate_match_scores(self, request, queryset):
+        """Rescore the selected applications in one batch per job"""
+        rescored = 0
+        for job in Job.objects.filter(id__in=queryset.values('job_id')).only('id'):
+            rescored += score_and_save_applications(job, queryset.filter(job=job))
+        self.message_user(request, f'Recalculated {rescored} match scores.')
 
 
 @admin.register(SavedJob)
-class SavedJobAdmin(admin.ModelAdmin):
+class SavedJobAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     """Admin configuration for SavedJob model"""
     
     list_display = ('user', 'job', 'saved_at')
     list_filter = ('saved_at',)
     search_fields = ('user__email', 'job__title')
     readonly_fields = ('saved_at',)
+    raw_id_fields = ('user', 'job')
+    list_select_related = ('user', 'job', 'job__employer', 'job__employer__profile')
+    list_only = ('id', 'saved_at', 'user__email', 'job__title', 'job__employer__profile__company_name')
+    show_full_result_count = False
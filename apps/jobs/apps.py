@@ -5,3 +5,6 @@ class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.jobs'
     verbose_name = 'Job Postings'
+    
+    def ready(self):
+        import apps.jobs.signals
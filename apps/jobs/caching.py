@@ -0,0 +1,28 @@
+"""
+Response caching helpers for jobs app
+"""
+import hashlib
+
+from django.core.cache import cache
+
+JOB_CACHE_TIMEOUT = 60  # seconds
+JOB_CACHE_VERSION_KEY = 'jobs:version'
+
+
+def get_job_cache_version():
+    """Current version of cached job responses"""
+    return cache.get_or_set(JOB_CACHE_VERSION_KEY, 1, None)
+
+
+def bump_job_cache_version():
+    """Invalidate every cached job response by moving to a new version"""
+    try:
+        cache.incr(JOB_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(JOB_CACHE_VERSION_KEY, 1, None)
+
+
+def job_cache_key(kind, suffix):
+    """Build a versioned cache key such as jobs:list:v3:<digest>"""
+    digest = hashlib.md5(str(suffix).encode()).hexdigest()
+    return f'jobs:{kind}:v{get_job_cache_version()}:{digest}'
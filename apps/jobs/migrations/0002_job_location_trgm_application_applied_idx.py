@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-15 14:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+LOCATION_TRGM_INDEX = django.contrib.postgres.indexes.GinIndex(
+    fields=['location'], name='job_location_trgm_idx', opclasses=['gin_trgm_ops']
+)
+
+
+def add_location_trgm_index(apps, schema_editor):
+    """pg_trgm and GIN indexes only exist on PostgreSQL"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.add_index(apps.get_model('jobs', 'Job'), LOCATION_TRGM_INDEX)
+
+
+def remove_location_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('jobs', 'Job'), LOCATION_TRGM_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='job',
+                    index=LOCATION_TRGM_INDEX,
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(add_location_trgm_index, remove_location_trgm_index),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', '-applied_at'], name='app_applicant_applied_idx'),
+        ),
+    ]
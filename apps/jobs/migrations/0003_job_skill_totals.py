@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-15 10:45
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_skill_totals(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    job_skills = JobSkill.objects.filter(job=models.OuterRef('pk')).order_by().values('job')
+    Job.objects.update(
+        total_skill_importance=Coalesce(
+            models.Subquery(job_skills.annotate(total=models.Sum('importance')).values('total')),
+            models.Value(0.0),
+        ),
+        required_skill_count=Coalesce(
+            models.Subquery(job_skills.filter(is_required=True).annotate(count=models.Count('id')).values('count')),
+            models.Value(0),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_location_trgm_application_applied_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='required_skill_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='total_skill_importance',
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_skill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_skill_totals'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-created_at'], name='job_status_active_idx'),
+        ),
+    ]
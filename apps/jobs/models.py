@@ -1,11 +1,59 @@
 """
 Job-related models for SkillMatchHub
 """
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.conf import settings
+from django.utils import timezone
 from apps.profiles.models import Skill
 
 
+class JobQuerySet(models.QuerySet):
+    """QuerySet for Job"""
+    
+    def with_details(self):
+        """Fetch the employer, profile and skills that JobSerializer reads"""
+        return self.select_related('employer__profile').prefetch_related(
+            models.Prefetch('jobskill_set', queryset=JobSkill.objects.select_related('skill'))
+        )
+    
+    def without_user_flags(self):
+        """Annotate is_saved/has_applied as False, for responses shared between users"""
+        return self.annotate(
+            is_saved_flag=models.Value(False),
+            has_applied_flag=models.Value(False)
+        )
+    
+    def with_user_flags(self, user):
+        """Annotate whether user has saved or applied to each job"""
+        if not user.is_authenticated:
+            return self.without_user_flags()
+        return self.annotate(
+            is_saved_flag=models.Exists(SavedJob.objects.filter(user=user, job=models.OuterRef('pk'))),
+            has_applied_flag=models.Exists(Application.objects.filter(applicant=user, job=models.OuterRef('pk')))
+        )
+    
+    def refresh_skill_totals(self):
+        """
+        Recompute total_skill_importance and required_skill_count from job_skills in one UPDATE.
+        
+        updated_at is bumped too, since it keys the cached match scores.
+        """
+        job_skills = JobSkill.objects.filter(job=models.OuterRef('pk')).order_by().values('job')
+        return self.update(
+            updated_at=timezone.now(),
+            total_skill_importance=Coalesce(
+                models.Subquery(job_skills.annotate(total=models.Sum('importance')).values('total')),
+                models.Value(0.0),
+            ),
+            required_skill_count=Coalesce(
+                models.Subquery(job_skills.filter(is_required=True).annotate(count=models.Count('id')).values('count')),
+                models.Value(0),
+            ),
+        )
+
+
 class Job(models.Model):
     """Job posting model"""
     
@@ -63,20 +111,35 @@ class Job(models.Model):
     views_count = models.IntegerField(default=0)
     applications_count = models.IntegerField(default=0)
     
+    # Denormalized from job_skills (kept current by signals) so scoring needs no aggregate
+    total_skill_importance = models.FloatField(default=0)
+    required_skill_count = models.PositiveIntegerField(default=0)
+    
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     expires_at = models.DateTimeField(null=True, blank=True)
     
+    objects = JobQuerySet.as_manager()
+    
     class Meta:
         db_table = 'jobs'
         # Note: Removed ordering due to djongo/MongoDB limitations with ORDER BY
         indexes = [
             models.Index(fields=['status', '-created_at']),
             models.Index(fields=['employer', 'status']),
+            # Partial index for the active-jobs list (newest first); draft/closed rows stay out of it
+            models.Index(fields=['-created_at'], name='job_status_active_idx', condition=models.Q(status='active')),
+            # Trigram index for location__icontains; created on PostgreSQL only (see migration 0002)
+            GinIndex(fields=['location'], opclasses=['gin_trgm_ops'], name='job_location_trgm_idx'),
         ]
     
     def __str__(self):
         return f"{self.title} at {self.employer.profile.company_name if hasattr(self.employer, 'profile') else 'Company'}"
+    
+    def refresh_skill_totals(self):
+        """Recompute the denormalized skill totals and reload them on this instance"""
+        Job.objects.filter(pk=self.pk).refresh_skill_totals()
+        self.refresh_from_db(fields=['total_skill_importance', 'required_skill_count', 'updated_at'])
 
 
 class JobSkill(models.Model):
@@ -132,6 +195,7 @@ class Application(models.Model):
         indexes = [
             models.Index(fields=['job', 'status']),
             models.Index(fields=['applicant', 'status']),
+            models.Index(fields=['applicant', '-applied_at'], name='app_applicant_applied_idx'),
         ]
     
     def __str__(self):
@@ -0,0 +1,23 @@
+"""
+Pagination classes for jobs app
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class JobCursorPagination(CursorPagination):
+    """Keyset pagination over the indexed created_at column"""
+    
+    ordering = '-created_at'
+    page_size = 25
+
+
+class ApplicationCursorPagination(JobCursorPagination):
+    """Keyset pagination for applications, newest first"""
+    
+    ordering = '-applied_at'
+
+
+class SavedJobCursorPagination(JobCursorPagination):
+    """Keyset pagination for saved jobs, most recently saved first"""
+    
+    ordering = '-saved_at'
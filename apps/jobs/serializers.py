@@ -2,6 +2,7 @@
 Serializers for jobs app
 """
 from rest_framework import serializers
+from django.db import transaction
 from .models import Job, JobSkill, Application, SavedJob
 from apps.profiles.models import Skill
 from apps.profiles.serializers import SkillSerializer
@@ -33,9 +34,8 @@ class EmployerInfoSerializer(serializers.Serializer):
     company_name = serializers.SerializerMethodField()
     
     def get_company_name(self, obj):
-        if hasattr(obj, 'profile') and obj.profile:
-            return obj.profile.company_name
-        return ''
+        profile = getattr(obj, 'profile', None)
+        return profile.company_name if profile else ''
 
 
 class JobSerializer(serializers.ModelSerializer):
@@ -62,33 +62,50 @@ class JobSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'employer', 'views_count', 'applications_count', 'created_at', 'updated_at')
     
     def get_employer_company(self, obj):
-        if hasattr(obj.employer, 'profile') and obj.employer.profile:
-            return obj.employer.profile.company_name
-        return ''
+        profile = getattr(obj.employer, 'profile', None)
+        return profile.company_name if profile else ''
     
     def get_is_saved(self, obj):
         """Check if the current user has saved this job"""
+        # Annotated by JobQuerySet.with_user_flags
+        if hasattr(obj, 'is_saved_flag'):
+            return obj.is_saved_flag
+        
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            try:
-                # Use count() > 0 instead of exists() for djongo compatibility
-                return SavedJob.objects.filter(user=request.user, job_id=obj.id).count() > 0
-            except Exception:
-                return False
+            return SavedJob.objects.filter(user=request.user, job_id=obj.id).exists()
         return False
     
     def get_has_applied(self, obj):
         """Check if the current user has applied to this job"""
+        if hasattr(obj, 'has_applied_flag'):
+            return obj.has_applied_flag
+        
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            try:
-                # Use count() > 0 instead of exists() for djongo compatibility
-                return Application.objects.filter(applicant=request.user, job_id=obj.id).count() > 0
-            except Exception:
-                return False
+            return Application.objects.filter(applicant=request.user, job_id=obj.id).exists()
         return False
 
 
+class JobCardSerializer(JobSerializer):
+    """Serializer for job cards; omits the long text fields and per-user flags"""
+    
+    class Meta(JobSerializer.Meta):
+        fields = (
+            'id', 'employer', 'employer_company',
+            'title', 'location', 'is_remote', 'employment_type', 'experience_level',
+            'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+            'skills', 'status', 'created_at'
+        )
+
+
+class JobListSerializer(JobCardSerializer):
+    """Serializer for job list cards"""
+    
+    class Meta(JobCardSerializer.Meta):
+        fields = JobCardSerializer.Meta.fields + ('is_saved', 'has_applied')
+
+
 class JobCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating jobs"""
     
@@ -106,10 +123,15 @@ class JobCreateUpdateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Create job with skills"""
         skills_data = validated_data.pop('jobskill_set', [])
-        job = Job.objects.create(**validated_data)
         
-        for skill_data in skills_data:
-            JobSkill.objects.create(job=job, **skill_data)
+        with transaction.atomic():
+            job = Job.objects.create(**validated_data)
+            JobSkill.objects.bulk_create(
+                [JobSkill(job=job, **skill_data) for skill_data in skills_data],
+                batch_size=500
+            )
+            # bulk_create skips the JobSkill signals
+            job.refresh_skill_totals()
         
         return job
     
@@ -119,13 +141,19 @@ class JobCreateUpdateSerializer(serializers.ModelSerializer):
         
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
         
-        if skills_data is not None:
-            # Remove old skills and add new ones
-            instance.jobskill_set.all().delete()
-            for skill_data in skills_data:
-                JobSkill.objects.create(job=instance, **skill_data)
+        with transaction.atomic():
+            instance.save()
+            
+            if skills_data is not None:
+                # Remove old skills and add new ones
+                JobSkill.objects.filter(job=instance).delete()
+                JobSkill.objects.bulk_create(
+                    [JobSkill(job=instance, **skill_data) for skill_data in skills_data],
+                    batch_size=500
+                )
+                # bulk_create skips the JobSkill signals
+                instance.refresh_skill_totals()
         
         return instance
 
@@ -152,24 +180,23 @@ class ApplicationSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'applicant', 'match_score', 'applied_at', 'updated_at')
     
     def get_company_name(self, obj):
-        if hasattr(obj.job.employer, 'profile') and obj.job.employer.profile:
-            return obj.job.employer.profile.company_name
-        return ''
+        profile = getattr(obj.job.employer, 'profile', None)
+        return profile.company_name if profile else ''
     
     def get_applicant_name(self, obj):
-        if hasattr(obj.applicant, 'profile') and obj.applicant.profile:
-            return obj.applicant.profile.display_name
-        return obj.applicant.full_name
+        profile = getattr(obj.applicant, 'profile', None)
+        return profile.display_name if profile else obj.applicant.full_name
     
     def get_employer_contact(self, obj):
         """Only show employer contact info if application is accepted"""
         if obj.status == 'accepted':
             employer = obj.job.employer
+            profile = getattr(employer, 'profile', None)
             return {
                 'email': employer.email,
                 'phone': employer.phone_number,
                 'name': employer.full_name,
-                'company_name': employer.profile.company_name if hasattr(employer, 'profile') and employer.profile else ''
+                'company_name': profile.company_name if profile else ''
             }
         return None
 
@@ -186,8 +213,7 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         job = attrs.get('job')
         user = self.context['request'].user
         
-        # Use count() > 0 instead of exists() for djongo compatibility
-        if Application.objects.filter(job_id=job.id, applicant=user).count() > 0:
+        if Application.objects.filter(job_id=job.id, applicant=user).exists():
             raise serializers.ValidationError("You have already applied to this job.")
         
         if job.status != 'active':
@@ -199,7 +225,7 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
 class SavedJobSerializer(serializers.ModelSerializer):
     """Serializer for SavedJob model"""
     
-    job = JobSerializer(read_only=True)
+    job = JobCardSerializer(read_only=True)
     
     class Meta:
         model = SavedJob
@@ -0,0 +1,58 @@
+"""
+Signal handlers for jobs app
+"""
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .caching import bump_job_cache_version
+from apps.profiles.models import Skill
+from .models import Job, JobSkill
+
+
+# JobSkill has no post_delete receivers on purpose: they would make
+# job_skills deletes (skill replacement, job cascades) fetch and signal row by
+# row. Code that deletes job skills refreshes the totals itself, and the Skill
+# receivers below cover the cascade from deleting a skill.
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cache(sender, **kwargs):
+    """Drop cached job responses when a job or its skills change"""
+    bump_job_cache_version()
+
+
+@receiver(post_save, sender=JobSkill)
+def update_job_skill_totals(sender, instance, **kwargs):
+    """Keep Job.total_skill_importance and Job.required_skill_count in step with job_skills"""
+    if JobSkill.job.is_cached(instance):
+        # Also refresh the Job object the caller is holding
+        instance.job.refresh_skill_totals()
+    else:
+        Job.objects.filter(pk=instance.job_id).refresh_skill_totals()
+
+
+@receiver(m2m_changed, sender=Job.skills_required.through)
+def update_job_skill_totals_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    """skills_required.add()/remove() bypass JobSkill save signals"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        instance.refresh_skill_totals()
+    elif pk_set:
+        Job.objects.filter(pk__in=pk_set).refresh_skill_totals()
+
+
+@receiver(pre_delete, sender=Skill)
+def remember_skill_jobs(sender, instance, **kwargs):
+    """Note which jobs require a skill before the delete cascades to their job_skills"""
+    instance._affected_job_ids = list(
+        JobSkill.objects.filter(skill_id=instance.pk).values_list('job_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Skill)
+def update_job_skill_totals_on_skill_delete(sender, instance, **kwargs):
+    """Recompute the skill totals of jobs that lost a required skill"""
+    job_ids = getattr(instance, '_affected_job_ids', None)
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids).refresh_skill_totals()
+        bump_job_cache_version()
@@ -0,0 +1,340 @@
+"""
+Tests for jobs app
+"""
+import json
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.jobs.models import Application, Job, JobSkill, SavedJob
+from apps.profiles.models import ProfileSkill, Skill
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestJobList:
+    """Test listing jobs"""
+    
+    def test_list_query_count_is_constant(self, job, employer_user, django_assert_num_queries):
+        """Test employer, profile and skills are not fetched per job"""
+        for i in range(5):
+            extra = Job.objects.create(
+                employer=employer_user,
+                title=f'Job {i}',
+                description='Description',
+                employment_type='full_time',
+                experience_level='mid',
+                status='active'
+            )
+            extra.skills_required.add(*job.skills_required.all())
+        
+        client = APIClient()
+        # One query for jobs joined to employer and profile, one for skills
+        with django_assert_num_queries(2):
+            response = client.get('/api/jobs/jobs/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 6
+        assert response.data['results'][0]['skills'][0]['skill']['name'] == 'Python'
+        assert 'description' not in response.data['results'][0]
+    
+    def test_list_is_paginated_newest_first(self, job, employer_user):
+        """Test job lists come back in cursor pages ordered by created_at"""
+        for i in range(30):
+            Job.objects.create(
+                employer=employer_user,
+                title=f'Job {i}',
+                description='Description',
+                employment_type='full_time',
+                experience_level='mid',
+                status='active'
+            )
+        
+        client = APIClient()
+        response = client.get('/api/jobs/jobs/')
+        
+        assert len(response.data['results']) == 25
+        assert response.data['results'][0]['title'] == 'Job 29'
+        
+        response = client.get(response.data['next'])
+        assert len(response.data['results']) == 6
+        assert response.data['next'] is None
+
+    
+    def test_list_flags_for_authenticated_user(self, job, job_seeker_user, django_assert_num_queries):
+        """Test is_saved and has_applied come back with the job rows"""
+        SavedJob.objects.create(user=job_seeker_user, job=job)
+        Application.objects.create(job=job, applicant=job_seeker_user)
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        # Jobs, skills, then one query for the user's flags
+        with django_assert_num_queries(3):
+            response = client.get('/api/jobs/jobs/')
+        
+        assert response.data['results'][0]['is_saved'] is True
+        assert response.data['results'][0]['has_applied'] is True
+
+    
+    def test_retrieve_increments_views_count(self, job):
+        """Test each retrieve counts one view"""
+        client = APIClient()
+        
+        response = client.get(f'/api/jobs/jobs/{job.id}/')
+        assert response.data['views_count'] == 1
+        
+        response = client.get(f'/api/jobs/jobs/{job.id}/')
+        assert response.data['views_count'] == 2
+        job.refresh_from_db()
+        assert job.views_count == 2
+
+    
+    def test_list_is_cached_until_a_job_changes(self, job, job_seeker_user, django_assert_num_queries):
+        """Test repeat list requests skip the job queries until a job is saved"""
+        client = APIClient()
+        client.get('/api/jobs/jobs/')
+        
+        with django_assert_num_queries(0):
+            response = client.get('/api/jobs/jobs/')
+        assert response.data['results'][0]['is_saved'] is False
+        
+        # Cached payload is shared, but flags are still per user
+        SavedJob.objects.create(user=job_seeker_user, job=job)
+        client.force_authenticate(user=job_seeker_user)
+        with django_assert_num_queries(1):
+            response = client.get('/api/jobs/jobs/')
+        assert response.data['results'][0]['is_saved'] is True
+        
+        job.title = 'Senior Python Developer'
+        job.save()
+        response = client.get('/api/jobs/jobs/')
+        assert response.data['results'][0]['title'] == 'Senior Python Developer'
+
+    
+    def test_export_streams_all_jobs(self, job, employer_user):
+        """Test export returns every active job as one JSON array"""
+        for i in range(30):
+            Job.objects.create(
+                employer=employer_user,
+                title=f'Job {i}',
+                description='Description',
+                employment_type='full_time',
+                experience_level='mid',
+                status='active'
+            )
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        response = client.get('/api/jobs/jobs/export/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        jobs = json.loads(b''.join(response.streaming_content))
+        assert len(jobs) == 31
+        assert jobs[0]['title'] == 'Job 29'
+        assert 'description' not in jobs[0]
+
+
+@pytest.mark.django_db
+class TestJobCreateUpdate:
+    """Test creating and updating jobs with skills"""
+    
+    def test_create_and_replace_skills(self, employer_user, skill):
+        """Test skills are written on create and replaced on update"""
+        django_skill = Skill.objects.create(name='Django')
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        data = {
+            'title': 'Backend Developer',
+            'description': 'Build APIs',
+            'employment_type': 'full_time',
+            'experience_level': 'mid',
+            'skills': [
+                {'skill_id': skill.id, 'importance': 1.0, 'is_required': True},
+                {'skill_id': django_skill.id, 'importance': 0.5, 'is_required': False},
+            ]
+        }
+        response = client.post('/api/jobs/jobs/', data, format='json')
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        job = Job.objects.get(title='Backend Developer')
+        assert set(JobSkill.objects.filter(job=job).values_list('skill_id', flat=True)) == {skill.id, django_skill.id}
+        assert (job.total_skill_importance, job.required_skill_count) == (1.5, 1)
+        
+        response = client.patch(
+            f'/api/jobs/jobs/{job.id}/',
+            {'skills': [{'skill_id': django_skill.id, 'importance': 0.8, 'is_required': True}]},
+            format='json'
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        job_skill = JobSkill.objects.get(job=job)
+        assert job_skill.skill_id == django_skill.id
+        assert job_skill.importance == 0.8
+        job.refresh_from_db()
+        assert (job.total_skill_importance, job.required_skill_count) == (0.8, 1)
+    
+    def test_deleting_skill_refreshes_job_totals(self, job, skill, job_seeker_user):
+        """Test removing a skill through its endpoint updates the totals of jobs requiring it"""
+        job.refresh_from_db()
+        assert (job.total_skill_importance, job.required_skill_count) == (1.0, 1)
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.delete(f'/api/profiles/skills/{skill.id}/')
+        
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not JobSkill.objects.filter(job=job).exists()
+        job.refresh_from_db()
+        assert (job.total_skill_importance, job.required_skill_count) == (0.0, 0)
+    
+    def test_skill_delete_is_one_query(self, job, django_assert_num_queries):
+        """Test deleting job skills in bulk does not fetch and signal them row by row"""
+        with django_assert_num_queries(1):
+            JobSkill.objects.filter(job=job).delete()
+
+
+@pytest.mark.django_db
+class TestSavedJobs:
+    """Test saved jobs"""
+    
+    def test_list_saved_jobs(self, job, job_seeker_user, django_assert_num_queries):
+        """Test listing saved jobs includes the nested job card"""
+        SavedJob.objects.create(user=job_seeker_user, job=job)
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        # Saved jobs joined to job, employer and profile, then skills
+        with django_assert_num_queries(2):
+            response = client.get('/api/jobs/saved/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0]['job']['title'] == 'Python Developer'
+        assert 'is_saved' not in response.data['results'][0]['job']
+    
+    def test_save_job_twice(self, job, job_seeker_user):
+        """Test saving the same job again is reported, not duplicated"""
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.post('/api/jobs/saved/', {'job_id': job.id})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['job']['title'] == 'Python Developer'
+        
+        response = client.post('/api/jobs/saved/', {'job_id': job.id})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['message'] == 'Job already saved'
+        assert SavedJob.objects.filter(user=job_seeker_user, job=job).count() == 1
+    
+    def test_save_missing_job(self, job_seeker_user):
+        """Test saving a job that does not exist"""
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.post('/api/jobs/saved/', {'job_id': 999})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestApplications:
+    """Test applying to jobs"""
+    
+    def test_apply_twice(self, job, job_seeker_user):
+        """Test a second application to the same job is rejected"""
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.post('/api/jobs/applications/', {'job': job.id})
+        assert response.status_code == status.HTTP_201_CREATED
+        
+        response = client.post('/api/jobs/applications/', {'job': job.id})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Application.objects.filter(job=job, applicant=job_seeker_user).count() == 1
+        job.refresh_from_db()
+        assert job.applications_count == 1
+    
+    def test_apply_stores_match_score(self, job, job_seeker_user, skill):
+        """Test the match score is calculated for a new application"""
+        ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.post('/api/jobs/applications/', {'job': job.id})
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        application = Application.objects.get(job=job, applicant=job_seeker_user)
+        assert application.match_score > 0.8
+    
+    def test_employer_sees_applications_to_own_jobs(self, job, job_seeker_user, employer_user, django_assert_num_queries):
+        """Test employers list the applications made to their jobs, without per-row queries"""
+        Application.objects.create(job=job, applicant=job_seeker_user)
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        # Applications joined to job, employer, applicant and both profiles
+        with django_assert_num_queries(1):
+            response = client.get('/api/jobs/applications/')
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert [a['applicant_email'] for a in response.data['results']] == ['jobseeker@example.com']
+    
+    def test_rescore_all(self, job, job_seeker_user, employer_user, skill):
+        """Test employers can rescore every application to a job in bulk"""
+        application = Application.objects.create(job=job, applicant=job_seeker_user, match_score=0.0)
+        ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        response = client.post('/api/jobs/applications/rescore_all/', {'job_id': job.id})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['rescored'] == 1
+        application.refresh_from_db()
+        assert application.match_score > 0.8
+    
+    def test_rescore_all_requires_employer(self, job, job_seeker_user):
+        """Test job seekers cannot rescore applications"""
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.post('/api/jobs/applications/rescore_all/', {'job_id': job.id})
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestApplicationAdmin:
+    """Test the application admin"""
+    
+    def test_recalculate_match_scores_action(self, client, job, job_seeker_user, skill):
+        """Test the admin action rescores the selected applications from the changelist"""
+        admin_user = User.objects.create_superuser(email='admin@example.com', password='adminpass123')
+        ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        application = Application.objects.create(job=job, applicant=job_seeker_user, match_score=0.0)
+        client.force_login(admin_user)
+        
+        response = client.post('/admin/jobs/application/', {
+            'action': 'recalculate_match_scores',
+            '_selected_action': [application.pk],
+        })
+        
+        assert response.status_code == 302
+        application.refresh_from_db()
+        assert application.match_score > 0.8
@@ -6,11 +6,23 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch, Q
+from django.http import StreamingHttpResponse
+from django.utils.http import urlencode
 
-from .models import Job, Application, SavedJob
+from apps.matching.services import calculate_match_score, score_and_save_applications
+from config.renderers import StreamingJSONRenderer
+from apps.matching.tasks import score_application
+from .caching import JOB_CACHE_TIMEOUT, job_cache_key
+from .models import Job, JobSkill, Application, SavedJob
+from .pagination import ApplicationCursorPagination, JobCursorPagination, SavedJobCursorPagination
 from .serializers import (
     JobSerializer,
+    JobListSerializer,
+    JobCardSerializer,
     JobCreateUpdateSerializer,
     ApplicationSerializer,
     ApplicationCreateSerializer,
@@ -21,19 +33,20 @@ from .serializers import (
 class JobViewSet(viewsets.ModelViewSet):
     """ViewSet for Job model"""
     
-    # Note: Removed select_related and prefetch_related due to djongo/MongoDB limitations
-    # djongo doesn't handle JOINs with ORDER BY properly
     queryset = Job.objects.all()
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['employment_type', 'experience_level', 'is_remote', 'status']
     search_fields = ['title', 'description', 'location']
-    pagination_class = None  # Disable pagination for djongo compatibility
-    # Note: Removed OrderingFilter due to djongo limitations with ORDER BY + JOINs
+    pagination_class = JobCursorPagination
     
     def get_serializer_class(self):
         """Use different serializers for different actions"""
         if self.action in ['create', 'update', 'partial_update']:
             return JobCreateUpdateSerializer
+        if self.action == 'list':
+            return JobListSerializer
+        if self.action == 'export':
+            return JobCardSerializer
         return JobSerializer
     
     def get_permissions(self):
@@ -44,36 +57,69 @@ class JobViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset based on user and status"""
-        # Simple query for djongo compatibility - just return active jobs
-        # The my_jobs action handles employer's own jobs separately
-        queryset = Job.objects.filter(status='active')
+        # The my_jobs action handles employer's own jobs separately.
+        # Responses may be cached and shared, so the per-user flags are
+        # filled in afterwards by apply_user_flags
+        queryset = Job.objects.filter(status='active').with_details().without_user_flags()
+        if self.action in ['list', 'export']:
+            # Columns read by the card serializers; skips the large text fields
+            queryset = queryset.only(
+                'id', 'employer', 'employer__profile__company_name',
+                'title', 'location', 'is_remote', 'employment_type', 'experience_level',
+                'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+                'status', 'created_at'
+            )
         
-        # Filter by location (simple filter, no Q objects with OR)
+        # Filter by location; icontains is served by the trigram index on location
         location = self.request.query_params.get('location')
         if location:
-            # Just filter by location, skip OR with is_remote for djongo compatibility
             queryset = queryset.filter(location__icontains=location)
         
         return queryset
     
     def list(self, request, *args, **kwargs):
-        """Override list to handle djongo compatibility"""
-        try:
-            queryset = self.get_queryset().order_by()  # Clear any ordering
-            jobs = list(queryset)
-            serializer = self.get_serializer(jobs, many=True)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response([], status=status.HTTP_200_OK)
+        """List active jobs, serving the shared part of each page from cache"""
+        cache_key = job_cache_key('list', urlencode(sorted(request.query_params.lists()), doseq=True))
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, JOB_CACHE_TIMEOUT)
+        
+        self.apply_user_flags(data['results'])
+        return Response(data)
     
     def retrieve(self, request, *args, **kwargs):
-        """Increment view count on retrieve"""
-        instance = self.get_object()
-        # Use direct increment instead of F() expression (djongo/MongoDB doesn't support F() in updates)
-        instance.views_count = (instance.views_count or 0) + 1
-        instance.save(update_fields=['views_count'])
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        """Return a job from cache when possible and increment its view count"""
+        cache_key = job_cache_key('detail', kwargs[self.lookup_field])
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_serializer(self.get_object()).data
+            cache.set(cache_key, data, JOB_CACHE_TIMEOUT)
+        
+        # Single atomic UPDATE on every view, cached or not; concurrent views are not lost
+        job = Job.objects.filter(pk=data['id'])
+        job.update(views_count=F('views_count') + 1)
+        
+        # The counter and per-user flags are read fresh in one query
+        live = job.with_user_flags(request.user).values('views_count', 'is_saved_flag', 'has_applied_flag').get()
+        data['views_count'] = live['views_count']
+        data['is_saved'] = live['is_saved_flag']
+        data['has_applied'] = live['has_applied_flag']
+        return Response(data)
+    
+    def apply_user_flags(self, jobs_data):
+        """Set is_saved/has_applied on serialized jobs for the current user in one query"""
+        flags = {}
+        if self.request.user.is_authenticated and jobs_data:
+            flags = {
+                job_id: (is_saved, has_applied)
+                for job_id, is_saved, has_applied in Job.objects.filter(
+                    id__in=[job['id'] for job in jobs_data]
+                ).with_user_flags(self.request.user).values_list('id', 'is_saved_flag', 'has_applied_flag')
+            }
+        
+        for job in jobs_data:
+            job['is_saved'], job['has_applied'] = flags.get(job['id'], (False, False))
     
     def perform_create(self, serializer):
         """Set employer to current user"""
@@ -81,6 +127,19 @@ class JobViewSet(viewsets.ModelViewSet):
             raise drf_serializers.ValidationError("Only employers can create jobs.")
         serializer.save(employer=self.request.user)
     
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Export every active job as one JSON array, streamed row by row"""
+        queryset = self.filter_queryset(self.get_queryset()).order_by('-created_at')
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        
+        items = (serializer_class(job, context=context).data for job in queryset.iterator(chunk_size=500))
+        return StreamingHttpResponse(
+            StreamingJSONRenderer().render_iter(items),
+            content_type='application/json'
+        )
+    
     @action(detail=False, methods=['get'])
     def my_jobs(self, request):
         """Get jobs posted by the current employer"""
@@ -90,14 +149,14 @@ class JobViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        try:
-            # Use simple filter without JOINs and clear any ordering for djongo compatibility
-            jobs = list(Job.objects.filter(employer_id=request.user.id).order_by())
-            serializer = self.get_serializer(jobs, many=True)
-            return Response(serializer.data)
-        except Exception as e:
-            # Return empty list on any database error
-            return Response([], status=status.HTTP_200_OK)
+        jobs = (
+            Job.objects.filter(employer_id=request.user.id)
+            .with_details()
+            .with_user_flags(request.user)
+            .order_by()
+        )
+        serializer = self.get_serializer(jobs, many=True)
+        return Response(serializer.data)
 
 
 class ApplicationViewSet(viewsets.ModelViewSet):
@@ -107,36 +166,20 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['status', 'job']
-    pagination_class = None  # Disable pagination for djongo compatibility
-    # Note: Removed OrderingFilter due to djongo/MongoDB limitations
+    pagination_class = ApplicationCursorPagination
     
     def get_queryset(self):
         """Return applications based on user type"""
         user = self.request.user
+        # ApplicationSerializer reads the job, its employer's profile and the applicant's profile
+        queryset = Application.objects.select_related('job__employer__profile', 'applicant__profile')
         
         if user.is_employer:
             # Employers see applications to their jobs
-            # Avoid JOIN by first getting job IDs, then filtering applications
-            try:
-                job_ids = list(Job.objects.filter(employer_id=user.id).order_by().values_list('id', flat=True))
-                if job_ids:
-                    return Application.objects.filter(job_id__in=job_ids).order_by()
-                return Application.objects.none()
-            except Exception:
-                return Application.objects.none()
+            return queryset.filter(job__employer_id=user.id).order_by()
         else:
             # Job seekers see their own applications
-            return Application.objects.filter(applicant_id=user.id).order_by()
-    
-    def list(self, request, *args, **kwargs):
-        """Override list to handle djongo compatibility"""
-        try:
-            queryset = self.get_queryset().order_by()  # Clear any ordering
-            applications = list(queryset)
-            serializer = self.get_serializer(applications, many=True)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response([], status=status.HTTP_200_OK)
+            return queryset.filter(applicant_id=user.id).order_by()
     
     def get_serializer_class(self):
         """Use different serializers for different actions"""
@@ -146,18 +189,53 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Create application and update job applications count"""
-        application = serializer.save(applicant=self.request.user)
+        # Calculate match score off the request path once a Celery broker is configured;
+        # otherwise compute it up front so it is written with the INSERT
+        score_later = bool(getattr(settings, 'CELERY_BROKER_URL', None))
+        extra = {}
+        if not score_later:
+            extra['match_score'] = calculate_match_score(
+                serializer.validated_data['job'], self.request.user.profile
+            )
+        application = serializer.save(applicant=self.request.user, **extra)
         
-        # Update applications count (use direct increment for djongo/MongoDB compatibility)
-        job = application.job
-        job.applications_count = (job.applications_count or 0) + 1
-        job.save(update_fields=['applications_count'])
+        # Update applications count
+        Job.objects.filter(pk=application.job_id).update(applications_count=F('applications_count') + 1)
         
-        # Calculate match score using matching algorithm
-        from apps.matching.services import calculate_match_score
-        match_score = calculate_match_score(job, self.request.user.profile)
-        application.match_score = match_score
-        application.save(update_fields=['match_score'])
+        if score_later:
+            transaction.on_commit(lambda: score_application.delay(application.id))
+    
+    @action(detail=False, methods=['post'])
+    def rescore_all(self, request):
+        """Recalculate match scores for every application to one of the employer's jobs"""
+        job_id = request.data.get('job_id')
+        
+        if not job_id:
+            return Response(
+                {'error': 'job_id is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not request.user.is_employer:
+            return Response(
+                {'error': 'Only employers can access this endpoint.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            job = Job.objects.only('id').get(id=job_id, employer=request.user)
+        except Job.DoesNotExist:
+            return Response(
+                {'error': 'Job not found or you do not have permission to access it.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        rescored = score_and_save_applications(job, Application.objects.filter(job=job))
+        
+        return Response({
+            'job_id': job.id,
+            'rescored': rescored
+        })
     
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -190,12 +268,17 @@ class SavedJobViewSet(viewsets.ModelViewSet):
     
     serializer_class = SavedJobSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = None  # Disable pagination for djongo compatibility
+    pagination_class = SavedJobCursorPagination
+    # Default OrderingFilter is active here, and cursor pagination takes its ordering from it
+    ordering = SavedJobCursorPagination.ordering
     
     def get_queryset(self):
         """Return saved jobs for current user"""
-        # Note: Removed select_related due to djongo/MongoDB JOIN limitations
-        return SavedJob.objects.filter(user=self.request.user).order_by()
+        return SavedJob.objects.filter(user=self.request.user).select_related(
+            'job__employer__profile'
+        ).prefetch_related(
+            Prefetch('job__jobskill_set', queryset=JobSkill.objects.select_related('skill'))
+        ).order_by()
     
     def create(self, request, *args, **kwargs):
         """Save a job"""
@@ -207,26 +290,23 @@ class SavedJobViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            job = Job.objects.get(id=job_id)
-        except Job.DoesNotExist:
+        if not Job.objects.filter(id=job_id).exists():
             return Response(
                 {'error': 'Job not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        saved_job, created = SavedJob.objects.get_or_create(
-            user=request.user,
-            job=job
-        )
-        
-        if not created:
+        # Insert directly and let the unique (user, job) constraint reject a duplicate
+        try:
+            with transaction.atomic():
+                saved_job = SavedJob.objects.create(user=request.user, job_id=job_id)
+        except IntegrityError:
             return Response(
                 {'message': 'Job already saved'},
                 status=status.HTTP_200_OK
             )
         
-        serializer = self.get_serializer(saved_job)
+        serializer = self.get_serializer(self.get_queryset().get(pk=saved_job.pk))
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     @action(detail=False, methods=['delete'])
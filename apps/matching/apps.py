@@ -5,3 +5,6 @@ class MatchingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.matching'
     verbose_name = 'Skill Matching'
+    
+    def ready(self):
+        import apps.matching.signals
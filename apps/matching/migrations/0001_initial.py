@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-15 10:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+        ('jobs', '0002_job_location_trgm_application_applied_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_cache', to='jobs.job')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_cache', to='profiles.profile')),
+            ],
+            options={
+                'db_table': 'match_cache',
+                'indexes': [models.Index(fields=['job', '-score'], name='match_cache_job_score_idx')],
+                'unique_together': {('job', 'profile')},
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+"""
+Models for matching app
+"""
+from django.db import models
+
+from apps.jobs.models import Job
+from apps.profiles.models import Profile
+
+
+class MatchCache(models.Model):
+    """Precomputed top candidates for a job, refreshed by recompute_top_matches"""
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='match_cache')
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='match_cache')
+    score = models.FloatField()
+    computed_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'match_cache'
+        unique_together = ['job', 'profile']
+        indexes = [
+            models.Index(fields=['job', '-score'], name='match_cache_job_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} - {self.profile_id} ({self.score})"
@@ -0,0 +1,11 @@
+"""
+Pagination classes for matching app
+"""
+from rest_framework.pagination import LimitOffsetPagination
+
+
+class MatchPagination(LimitOffsetPagination):
+    """Limit/offset over a ranked match queryset; keeps the existing ?limit= parameter"""
+    
+    default_limit = 50
+    max_limit = 200
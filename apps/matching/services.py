@@ -2,10 +2,31 @@
 Skill-based matching services for SkillMatchHub
 """
 import math
-from typing import Dict, List, Tuple
-from apps.jobs.models import Job, JobSkill
+from datetime import timedelta
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+from django.db.models import (
+    Case, Count, ExpressionWrapper, F, FloatField, Prefetch, Q, Sum, Value, When, prefetch_related_objects,
+)
+from django.db.models.functions import Cast, Least, Ln
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from apps.jobs.models import Application, Job, JobSkill
 from apps.profiles.models import Profile, ProfileSkill
+from .models import MatchCache
 
+try:
+    import numpy as np
+except ImportError:  # Optional; not in requirements-minimal.txt
+    np = None
+
+
+MATCH_SCORE_CACHE_TIMEOUT = 3600  # seconds
+
+# Precomputed top candidates per job (MatchCache)
+MATCH_CACHE_SIZE = 200
+MATCH_CACHE_MAX_AGE = timedelta(hours=24)
 
 # Skill level weights
 LEVEL_WEIGHTS = {
@@ -16,6 +37,14 @@ LEVEL_WEIGHTS = {
 }
 
 
+@lru_cache(maxsize=1024)
+def _skill_value(level: str, years_experience: float) -> float:
+    """Memoized body of calculate_skill_value; levels and years repeat a lot"""
+    base_weight = LEVEL_WEIGHTS.get(level, 1.0)
+    experience_factor = math.log1p(years_experience) * 0.15  # Logarithmic scaling for experience
+    return base_weight + experience_factor
+
+
 def calculate_skill_value(level: str, years_experience: float) -> float:
     """
     Calculate a numerical value for a skill based on level and years of experience.
@@ -27,9 +56,76 @@ def calculate_skill_value(level: str, years_experience: float) -> float:
     Returns:
         Float value representing skill competency (0-2.5 range typically)
     """
-    base_weight = LEVEL_WEIGHTS.get(level, 1.0)
-    experience_factor = math.log(1 + years_experience) * 0.15  # Logarithmic scaling for experience
-    return base_weight + experience_factor
+    return _skill_value(level, float(years_experience))
+
+
+def _job_skills(job: Job):
+    """Job skills, reusing a prefetch when one was done; scoring only needs skill_id"""
+    return job.jobskill_set.all()
+
+
+def _profile_skills(profile: Profile):
+    """Profile skills, reusing a prefetch when one was done; scoring only needs skill_id"""
+    return profile.profileskill_set.all()
+
+
+def _build_job_requirements(job_skills) -> Tuple[Dict[int, Tuple[float, bool]], float, FrozenSet[int]]:
+    """
+    Build the job side of the score once so it can be reused across candidates.
+    
+    Returns:
+        ({skill_id: (importance, is_required)}, total_importance, required_skill_ids)
+    """
+    job_requirements: Dict[int, Tuple[float, bool]] = {}
+    total_importance = 0.0
+    
+    for js in job_skills:
+        job_requirements[js.skill_id] = (js.importance, js.is_required)
+        total_importance += js.importance
+    
+    required_skill_ids = frozenset(skill_id for skill_id, (_, is_req) in job_requirements.items() if is_req)
+    return job_requirements, total_importance, required_skill_ids
+
+
+def _build_candidate_values(profile_skills) -> Dict[int, float]:
+    """Build {skill_id: skill_value} for a candidate's skills"""
+    candidate_skill_values: Dict[int, float] = {}
+    
+    for ps in profile_skills:
+        candidate_skill_values[ps.skill_id] = calculate_skill_value(ps.level, ps.years_experience)
+    
+    return candidate_skill_values
+
+
+def _score_from_precomputed(
+    job_requirements: Dict[int, Tuple[float, bool]],
+    total_importance: float,
+    required_skill_ids: FrozenSet[int],
+    candidate_skill_values: Dict[int, float],
+) -> float:
+    """Score one candidate against precomputed job requirements"""
+    if total_importance == 0:
+        return 0.0
+    
+    # Weighted match score; candidate values are normalized assuming a max realistic value of 2.5
+    matched_importance = sum(
+        importance * min(candidate_skill_values[skill_id] / 2.5, 1.0)
+        for skill_id, (importance, _) in job_requirements.items()
+        if skill_id in candidate_skill_values
+    )
+    
+    # Calculate base match score
+    base_score = matched_importance / total_importance
+    
+    # Apply penalty if required skills are missing
+    if required_skill_ids:
+        required_ratio = len(required_skill_ids & candidate_skill_values.keys()) / len(required_skill_ids)
+        
+        # Strong penalty for missing required skills
+        if required_ratio < 1.0:
+            base_score *= (0.5 + 0.5 * required_ratio)  # Max 50% penalty
+    
+    return round(base_score, 3)
 
 
 def calculate_match_score(job: Job, profile: Profile) -> float:
@@ -50,78 +146,342 @@ def calculate_match_score(job: Job, profile: Profile) -> float:
         Float between 0 and 1 representing match percentage
     """
     try:
-        # Get job required skills with importance weights
-        # Note: Removed select_related due to djongo/MongoDB limitations
-        job_skills = list(job.jobskill_set.all().order_by())
-        
-        if not job_skills:
+        # Jobs without weighted skills score 0; the denormalized total avoids loading them
+        total_importance = job.total_skill_importance
+        if not total_importance:
             return 0.0
         
-        # Build dictionary of job requirements: {skill_name: (importance, is_required)}
-        job_requirements: Dict[str, Tuple[float, bool]] = {}
-        total_importance = 0.0
-        
-        for js in job_skills:
-            try:
-                skill_name = js.skill.name.lower()
-                job_requirements[skill_name] = (js.importance, js.is_required)
-                total_importance += js.importance
-            except Exception:
-                continue
-        
-        if total_importance == 0:
-            return 0.0
+        # Get job required skills with importance weights
+        job_requirements, _, required_skill_ids = _build_job_requirements(_job_skills(job))
         
         # Get candidate skills
-        # Note: Removed select_related due to djongo/MongoDB limitations
-        candidate_skills = list(profile.profileskill_set.all().order_by())
-        
-        # Build dictionary of candidate skills: {skill_name: skill_value}
-        candidate_skill_values: Dict[str, float] = {}
-        
-        for ps in candidate_skills:
-            try:
-                skill_name = ps.skill.name.lower()
-                skill_value = calculate_skill_value(ps.level, ps.years_experience)
-                candidate_skill_values[skill_name] = skill_value
-            except Exception:
-                continue
-        
-        # Calculate weighted match score
-        matched_importance = 0.0
-        required_skills_met = 0
-        total_required_skills = sum(1 for _, (_, is_req) in job_requirements.items() if is_req)
-        
-        for skill_name, (importance, is_required) in job_requirements.items():
-            if skill_name in candidate_skill_values:
-                # Candidate has this skill
-                candidate_value = candidate_skill_values[skill_name]
-                
-                # Normalize candidate value (assuming max realistic value is 2.5)
-                normalized_value = min(candidate_value / 2.5, 1.0)
-                
-                # Add weighted contribution
-                matched_importance += importance * normalized_value
-                
-                if is_required:
-                    required_skills_met += 1
-        
-        # Calculate base match score
-        base_score = matched_importance / total_importance if total_importance > 0 else 0
-        
-        # Apply penalty if required skills are missing
-        if total_required_skills > 0:
-            required_ratio = required_skills_met / total_required_skills
-            
-            # Strong penalty for missing required skills
-            if required_ratio < 1.0:
-                base_score *= (0.5 + 0.5 * required_ratio)  # Max 50% penalty
+        candidate_skills = list(_profile_skills(profile))
+        candidate_skill_values = _build_candidate_values(candidate_skills)
         
-        return round(base_score, 3)
+        return _score_from_precomputed(
+            job_requirements, total_importance, required_skill_ids, candidate_skill_values
+        )
     except Exception:
         return 0.0
 
 
+def match_score_cache_key(job: Job, profile: Profile) -> str:
+    """Cache key that changes whenever the job or the profile is updated"""
+    return (
+        f'ms:{job.id}:{int(job.updated_at.timestamp() * 1000000)}'
+        f':{profile.id}:{int(profile.updated_at.timestamp() * 1000000)}'
+    )
+
+
+def cached_match_score(job: Job, profile: Profile) -> float:
+    """
+    calculate_match_score backed by the cache.
+    
+    Profile.updated_at is touched when profile skills change (see
+    apps.profiles.signals) and Job.updated_at when job skills change (see
+    JobQuerySet.refresh_skill_totals), so either side's skill changes
+    expire the cached score.
+    """
+    key = match_score_cache_key(job, profile)
+    score = cache.get(key)
+    if score is None:
+        score = calculate_match_score(job, profile)
+        cache.set(key, score, MATCH_SCORE_CACHE_TIMEOUT)
+    return score
+
+
+def score_profiles(job: Job, profiles: List[Profile]) -> List[float]:
+    """
+    Score many candidate profiles against one job.
+    
+    The job requirements are built once. Profiles should have
+    profileskill_set prefetched.
+    
+    Args:
+        job: Job instance, ideally with jobskill_set prefetched
+        profiles: Profile instances to score
+    
+    Returns:
+        Scores in the same order as profiles
+    """
+    job_requirements, total_importance, required_skill_ids = _build_job_requirements(_job_skills(job))
+    
+    return [
+        _score_from_precomputed(
+            job_requirements,
+            total_importance,
+            required_skill_ids,
+            _build_candidate_values(_profile_skills(profile)),
+        )
+        for profile in profiles
+    ]
+
+
+def score_candidates_vectorized(job: Job, profiles: List[Profile]) -> List[float]:
+    """
+    Score many candidate profiles against one job with NumPy.
+    
+    Builds a (candidates x job skills) matrix of normalized skill values and
+    scores every candidate with one matrix-vector product. Falls back to
+    score_profiles when NumPy is not installed.
+    
+    Args:
+        job: Job instance, ideally with jobskill_set prefetched
+        profiles: Profile instances with profileskill_set prefetched
+    
+    Returns:
+        Scores in the same order as profiles
+    """
+    if np is None:
+        return score_profiles(job, profiles)
+    
+    job_requirements, total_importance, required_skill_ids = _build_job_requirements(_job_skills(job))
+    
+    if not profiles or total_importance == 0:
+        return [0.0] * len(profiles)
+    
+    skill_index = {skill_id: i for i, skill_id in enumerate(job_requirements)}
+    importance = np.array([imp for imp, _ in job_requirements.values()], dtype=np.float64)
+    is_required = np.array([req for _, req in job_requirements.values()], dtype=bool)
+    
+    # Normalized candidate values, zero where the candidate lacks the skill
+    matrix = np.zeros((len(profiles), len(skill_index)), dtype=np.float64)
+    for row, profile in enumerate(profiles):
+        for skill_id, value in _build_candidate_values(_profile_skills(profile)).items():
+            col = skill_index.get(skill_id)
+            if col is not None:
+                matrix[row, col] = min(value / 2.5, 1.0)
+    
+    scores = (matrix @ importance) / total_importance
+    
+    # Same penalty as _score_from_precomputed for missing required skills
+    if required_skill_ids:
+        required_ratio = (matrix[:, is_required] > 0).sum(axis=1) / len(required_skill_ids)
+        scores = np.where(required_ratio < 1.0, scores * (0.5 + 0.5 * required_ratio), scores)
+    
+    return np.round(scores, 3).tolist()
+
+
+def _required_penalty(required_met, total_required):
+    """SQL version of the missing-required-skills penalty in _score_from_precomputed"""
+    return Case(
+        When(
+            Q(**{f'{total_required}__gt': 0}) & Q(**{f'{required_met}__lt': F(total_required)}),
+            then=Value(0.5) + Value(0.5) * Cast(required_met, FloatField()) / Cast(total_required, FloatField()),
+        ),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+
+
+def _normalized_skill_value(prefix: str):
+    """SQL version of min(calculate_skill_value(level, years) / 2.5, 1.0)"""
+    base_weight = Case(
+        *[When(**{f'{prefix}level': level}, then=Value(weight)) for level, weight in LEVEL_WEIGHTS.items()],
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    experience_factor = Ln(F(f'{prefix}years_experience') + Value(1.0)) * Value(0.15)
+    return Least((base_weight + experience_factor) / Value(2.5), Value(1.0))
+
+
+def score_and_save_applications(job: Job, applications) -> int:
+    """
+    Score applications to one job in a single batch and store the scores.
+    
+    Args:
+        job: Job instance
+        applications: Application queryset for this job
+    
+    Returns:
+        Number of applications scored
+    """
+    prefetch_related_objects(
+        [job], Prefetch('jobskill_set', queryset=JobSkill.objects.only('job_id', 'skill_id', 'importance', 'is_required'))
+    )
+    # Scoring only needs ids and skill rows; skip cover letters, bios and the like.
+    # Start from a clean queryset so callers' select_related()/only() (such as
+    # the admin changelist's) cannot clash with the columns selected here
+    applications = list(
+        Application.objects.filter(pk__in=applications.values('pk')).select_related('applicant__profile').only(
+            'id', 'match_score', 'applicant__id', 'applicant__profile__id'
+        ).prefetch_related(
+            Prefetch(
+                'applicant__profile__profileskill_set',
+                queryset=ProfileSkill.objects.only('profile_id', 'skill_id', 'level', 'years_experience')
+            )
+        ).order_by()
+    )
+    
+    scores = score_candidates_vectorized(job, [application.applicant.profile for application in applications])
+    for application, match_score in zip(applications, scores):
+        application.match_score = match_score
+    Application.objects.bulk_update(applications, ['match_score'], batch_size=500)
+    return len(applications)
+
+
+def matching_candidates_queryset(job: Job, min_score: float = 0.3):
+    """
+    Profiles matching a job, annotated with `score` and ordered best first.
+    
+    Scoring, filtering and ordering run in one aggregated query, so callers
+    can slice or paginate it and only the requested rows are loaded.
+    
+    Args:
+        job: Job instance
+        min_score: Minimum match score to include (0-1)
+    
+    Returns:
+        Profile queryset; scores are not rounded
+    """
+    total_importance = job.total_skill_importance
+    if not total_importance:
+        return Profile.objects.none()
+    
+    job_requirements = {
+        js.skill_id: (js.importance, js.is_required)
+        for js in JobSkill.objects.filter(job=job).only('skill_id', 'importance', 'is_required')
+    }
+    required_ids = [skill_id for skill_id, (_, is_required) in job_requirements.items() if is_required]
+    normalized_value = _normalized_skill_value('profileskill__')
+    
+    profiles = Profile.objects.filter(
+        user__user_type='job_seeker',
+        is_public=True,
+        is_available=True
+    )
+    if min_score > 0:
+        # A profile sharing no skill with the job scores 0, so only look at
+        # profiles found through the skill -> profile index on profile_skills
+        profiles = profiles.filter(id__in=ProfileSkill.objects.filter(
+            skill_id__in=list(job_requirements)
+        ).values('profile_id'))
+    
+    return profiles.annotate(
+        matched_importance=Sum(Case(
+            *[
+                When(profileskill__skill_id=skill_id, then=normalized_value * Value(importance))
+                for skill_id, (importance, _) in job_requirements.items()
+            ],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )),
+        required_met=Count('profileskill', filter=Q(profileskill__skill_id__in=required_ids)),
+        total_required=Value(job.required_skill_count),
+    ).annotate(
+        score=ExpressionWrapper(
+            F('matched_importance') / Value(total_importance)
+            * _required_penalty('required_met', 'total_required'),
+            output_field=FloatField(),
+        ),
+    ).filter(
+        score__gte=min_score
+    ).order_by('-score', 'id').prefetch_related(
+        Prefetch('profileskill_set', queryset=ProfileSkill.objects.select_related('skill'))
+    )
+
+
+def matching_jobs_queryset(profile: Profile, min_score: float = 0.3):
+    """
+    Active jobs matching a profile, annotated with `score` and ordered best first.
+    
+    Scoring, filtering and ordering run in one aggregated query, so callers
+    can slice or paginate it and only the requested rows are loaded.
+    
+    Args:
+        profile: Profile instance
+        min_score: Minimum match score to include (0-1)
+    
+    Returns:
+        Job queryset; scores are not rounded
+    """
+    # Candidate skill values don't depend on the job, so build them once
+    candidate_skill_values = {
+        ps.skill_id: min(calculate_skill_value(ps.level, ps.years_experience) / 2.5, 1.0)
+        for ps in ProfileSkill.objects.filter(profile=profile).only('skill_id', 'level', 'years_experience')
+    }
+    
+    jobs = Job.objects.filter(status='active', total_skill_importance__gt=0)
+    if min_score > 0:
+        # A job sharing no skill with the profile scores 0, so only look at
+        # jobs found through the skill -> job index on job_skills
+        if not candidate_skill_values:
+            return Job.objects.none()
+        jobs = jobs.filter(id__in=JobSkill.objects.filter(
+            skill_id__in=list(candidate_skill_values)
+        ).values('job_id'))
+    
+    return jobs.annotate(
+        matched_importance=Sum(Case(
+            *[
+                When(jobskill__skill_id=skill_id, then=F('jobskill__importance') * Value(value))
+                for skill_id, value in candidate_skill_values.items()
+            ],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )),
+        required_met=Count('jobskill', filter=Q(
+            jobskill__is_required=True,
+            jobskill__skill_id__in=list(candidate_skill_values),
+        )),
+    ).annotate(
+        score=ExpressionWrapper(
+            F('matched_importance') / F('total_skill_importance')
+            * _required_penalty('required_met', 'required_skill_count'),
+            output_field=FloatField(),
+        ),
+    ).filter(
+        score__gte=min_score
+    ).order_by('-score', 'id').with_details()
+
+
+def cached_candidates_queryset(job: Job, min_score: float = 0.3):
+    """
+    Precomputed candidates for a job from MatchCache, ranked like
+    matching_candidates_queryset.
+    
+    Only the top MATCH_CACHE_SIZE candidates are stored, so the result is
+    capped at that size.
+    
+    Returns:
+        Profile queryset annotated with `score`, or None when the job has no
+        cache younger than MATCH_CACHE_MAX_AGE
+    """
+    if not MatchCache.objects.filter(job=job, computed_at__gte=timezone.now() - MATCH_CACHE_MAX_AGE).exists():
+        return None
+    
+    # Same eligibility as matching_candidates_queryset, in case a profile
+    # changed after the cache was computed
+    return Profile.objects.filter(
+        user__user_type='job_seeker',
+        is_public=True,
+        is_available=True,
+        match_cache__job=job,
+        match_cache__score__gte=min_score,
+    ).annotate(
+        score=F('match_cache__score'),
+    ).order_by('-score', 'id').prefetch_related(
+        Prefetch('profileskill_set', queryset=ProfileSkill.objects.select_related('skill'))
+    )
+
+
+def refresh_match_cache(job: Job) -> int:
+    """
+    Replace a job's MatchCache rows with its current top candidates.
+    
+    Returns:
+        Number of cached candidates
+    """
+    matches = find_matching_candidates(job, limit=MATCH_CACHE_SIZE, min_score=0)
+    
+    with transaction.atomic():
+        MatchCache.objects.filter(job=job).delete()
+        MatchCache.objects.bulk_create([
+            MatchCache(job=job, profile=profile, score=score) for profile, score in matches
+        ])
+    return len(matches)
+
+
 def find_matching_candidates(job: Job, limit: int = 50, min_score: float = 0.3) -> List[Tuple[Profile, float]]:
     """
     Find and rank candidates that match a job posting.
@@ -135,25 +495,8 @@ def find_matching_candidates(job: Job, limit: int = 50, min_score: float = 0.3)
         List of tuples (Profile, score) sorted by score descending
     """
     try:
-        # Get all job seeker profiles that are available and public
-        # Note: Removed select_related and prefetch_related due to djongo/MongoDB limitations
-        profiles = list(Profile.objects.filter(
-            user__user_type='job_seeker',
-            is_public=True,
-            is_available=True
-        ).order_by())
-        
-        # Calculate match scores
-        matches = []
-        for profile in profiles:
-            score = calculate_match_score(job, profile)
-            if score >= min_score:
-                matches.append((profile, score))
-        
-        # Sort by score descending
-        matches.sort(key=lambda x: x[1], reverse=True)
-        
-        return matches[:limit]
+        profiles = matching_candidates_queryset(job, min_score=min_score)[:limit]
+        return [(profile, round(profile.score, 3)) for profile in profiles]
     except Exception:
         return []
 
@@ -171,23 +514,8 @@ def find_matching_jobs(profile: Profile, limit: int = 50, min_score: float = 0.3
         List of tuples (Job, score) sorted by score descending
     """
     try:
-        # Get all active jobs
-        # Note: Removed select_related and prefetch_related due to djongo/MongoDB limitations
-        jobs = list(Job.objects.filter(
-            status='active'
-        ).order_by())
-        
-        # Calculate match scores
-        matches = []
-        for job in jobs:
-            score = calculate_match_score(job, profile)
-            if score >= min_score:
-                matches.append((job, score))
-        
-        # Sort by score descending
-        matches.sort(key=lambda x: x[1], reverse=True)
-        
-        return matches[:limit]
+        jobs = matching_jobs_queryset(profile, min_score=min_score)[:limit]
+        return [(job, round(job.score, 3)) for job in jobs]
     except Exception:
         return []
 
@@ -204,56 +532,48 @@ def get_skill_gap_analysis(job: Job, profile: Profile) -> Dict:
         Dictionary with matched skills, missing skills, and recommendations
     """
     try:
-        # Note: Removed select_related due to djongo/MongoDB limitations
-        job_skills = list(job.jobskill_set.all().order_by())
-        profile_skills = list(profile.profileskill_set.all().order_by())
+        # Names are only needed for display, so only the job side joins Skill
+        job_skills = list(job.jobskill_set.select_related('skill'))
+        profile_skills = list(_profile_skills(profile))
         
-        candidate_skills_dict = {}
-        for ps in profile_skills:
-            try:
-                candidate_skills_dict[ps.skill.name.lower()] = ps
-            except Exception:
-                continue
+        candidate_skills_dict = {ps.skill_id: ps for ps in profile_skills}
         
         matched_skills = []
         missing_skills = []
         improvement_areas = []
         
         for js in job_skills:
-            try:
-                skill_name = js.skill.name.lower()
+            if js.skill_id in candidate_skills_dict:
+                ps = candidate_skills_dict[js.skill_id]
+                matched_skills.append({
+                    'skill': js.skill.name,
+                    'required_importance': js.importance,
+                    'is_required': js.is_required,
+                    'candidate_level': ps.level,
+                    'candidate_experience': ps.years_experience,
+                })
                 
-                if skill_name in candidate_skills_dict:
-                    ps = candidate_skills_dict[skill_name]
-                    matched_skills.append({
-                        'skill': js.skill.name,
-                        'required_importance': js.importance,
-                        'is_required': js.is_required,
-                        'candidate_level': ps.level,
-                        'candidate_experience': ps.years_experience,
-                    })
-                    
-                    # Suggest improvement if below advanced level for important skills
-                    if js.importance >= 0.8 and ps.level in ['beginner', 'intermediate']:
-                        improvement_areas.append({
-                            'skill': js.skill.name,
-                            'current_level': ps.level,
-                            'suggested_level': 'advanced',
-                        })
-                else:
-                    missing_skills.append({
+                # Suggest improvement if below advanced level for important skills
+                if js.importance >= 0.8 and ps.level in ['beginner', 'intermediate']:
+                    improvement_areas.append({
                         'skill': js.skill.name,
-                        'importance': js.importance,
-                        'is_required': js.is_required,
+                        'current_level': ps.level,
+                        'suggested_level': 'advanced',
                     })
-            except Exception:
-                continue
+            else:
+                missing_skills.append({
+                    'skill': js.skill.name,
+                    'importance': js.importance,
+                    'is_required': js.is_required,
+                })
         
         return {
             'matched_skills': matched_skills,
             'missing_skills': missing_skills,
             'improvement_areas': improvement_areas,
-            'match_score': calculate_match_score(job, profile),
+            'match_score': _score_from_precomputed(
+                *_build_job_requirements(job_skills), _build_candidate_values(profile_skills)
+            ),
         }
     except Exception:
         return {
@@ -0,0 +1,33 @@
+"""
+Signal handlers for matching app
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.jobs.models import Job
+from apps.profiles.models import ProfileSkill
+from .models import MatchCache
+from .tasks import recompute_top_matches
+
+
+@receiver(post_save, sender=Job)
+def refresh_job_match_cache(sender, instance, created, **kwargs):
+    """Drop a job's precomputed matches when it changes and rebuild them in the background"""
+    if not created:
+        MatchCache.objects.filter(job_id=instance.pk).delete()
+    
+    # Without a broker the view falls back to live scoring until the next refresh
+    if getattr(settings, 'CELERY_BROKER_URL', None) and instance.status == 'active':
+        transaction.on_commit(lambda: recompute_top_matches.delay(instance.pk))
+
+
+# Profile saves (including the one every login triggers) leave MatchCache
+# alone: scores depend only on skills, and cached_candidates_queryset
+# re-checks is_public/is_available when reading.
+@receiver(post_save, sender=ProfileSkill)
+@receiver(post_delete, sender=ProfileSkill)
+def drop_profile_match_cache_on_skill_change(sender, instance, **kwargs):
+    """Drop a profile's precomputed matches when its skills change"""
+    MatchCache.objects.filter(profile_id=instance.profile_id).delete()
@@ -0,0 +1,42 @@
+"""
+Celery tasks for matching
+"""
+from celery import shared_task
+
+from apps.jobs.models import Application, Job
+from .services import calculate_match_score, refresh_match_cache
+
+
+@shared_task
+def score_application(application_id):
+    """Calculate and store the match score for an application"""
+    try:
+        application = Application.objects.select_related('job', 'applicant__profile').only(
+            'id', 'job__id', 'job__total_skill_importance', 'applicant__id', 'applicant__profile__id'
+        ).get(id=application_id)
+    except Application.DoesNotExist:
+        return f"Application with id {application_id} not found"
+    
+    match_score = calculate_match_score(application.job, application.applicant.profile)
+    Application.objects.filter(pk=application_id).update(match_score=match_score)
+    return match_score
+
+
+@shared_task
+def recompute_top_matches(job_id):
+    """Refresh the MatchCache rows for one job"""
+    try:
+        job = Job.objects.get(id=job_id)
+    except Job.DoesNotExist:
+        return f"Job with id {job_id} not found"
+    
+    return refresh_match_cache(job)
+
+
+@shared_task
+def recompute_all_top_matches():
+    """Nightly refresh of MatchCache for every active job, one task per job"""
+    job_ids = list(Job.objects.filter(status='active').values_list('id', flat=True))
+    for job_id in job_ids:
+        recompute_top_matches.delay(job_id)
+    return len(job_ids)
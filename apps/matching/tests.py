@@ -2,8 +2,17 @@
 Tests for matching algorithm
 """
 import pytest
-from apps.matching.services import calculate_match_score, calculate_skill_value
-from apps.profiles.models import ProfileSkill
+from django.db import connection
+from rest_framework.test import APIClient
+from django.test.utils import CaptureQueriesContext
+from apps.matching.services import (
+    cached_match_score, calculate_match_score, calculate_skill_value, find_matching_candidates,
+    find_matching_jobs, score_and_save_applications, score_candidates_vectorized, score_profiles,
+)
+from apps.jobs.models import Application
+from apps.matching.models import MatchCache
+from apps.matching.tasks import recompute_top_matches
+from apps.profiles.models import Profile, ProfileSkill, Skill
 
 
 @pytest.mark.django_db
@@ -61,3 +70,191 @@ class TestMatchingAlgorithm:
         
         score = calculate_match_score(job, profile)
         assert 0 < score < 1.0
+    
+    def test_score_profiles_matches_single_score(self, job, job_seeker_user, skill):
+        """Test batch scoring agrees with calculate_match_score"""
+        profile = job_seeker_user.profile
+        ProfileSkill.objects.create(
+            profile=profile,
+            skill=skill,
+            level='advanced',
+            years_experience=3
+        )
+        
+        assert score_profiles(job, [profile]) == [calculate_match_score(job, profile)]
+    
+    def test_vectorized_scores_match_score_profiles(self, job, job_seeker_user, employer_user, skill):
+        """Test vectorized scoring agrees with score_profiles"""
+        ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='intermediate',
+            years_experience=2
+        )
+        profiles = [job_seeker_user.profile, employer_user.profile]
+        
+        assert score_candidates_vectorized(job, profiles) == score_profiles(job, profiles)
+    
+    def test_find_matching_candidates_query_count(self, job, job_seeker_user, skill):
+        """Test candidate matching does not query per profile"""
+        ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='expert',
+            years_experience=5
+        )
+        
+        with CaptureQueriesContext(connection) as ctx:
+            matches = find_matching_candidates(job)
+        
+        assert [p.pk for p, _ in matches] == [job_seeker_user.profile.pk]
+        assert len(ctx.captured_queries) == 3
+    
+    def test_database_ranking_matches_calculate_match_score(self, job, job_seeker_user, skill):
+        """Test SQL-side scores agree with calculate_match_score in both directions"""
+        profile = job_seeker_user.profile
+        ProfileSkill.objects.create(
+            profile=profile,
+            skill=skill,
+            level='beginner',
+            years_experience=1.5
+        )
+        expected = calculate_match_score(job, profile)
+        
+        assert find_matching_candidates(job, min_score=0) == [(profile, expected)]
+        assert find_matching_jobs(profile, min_score=0) == [(job, expected)]
+        assert find_matching_jobs(profile, min_score=expected + 0.01) == []
+    
+    def test_cached_match_score_expires_on_skill_change(self, job, job_seeker_user, skill):
+        """Test cached scores are recomputed after the profile's skills change"""
+        profile = job_seeker_user.profile
+        assert cached_match_score(job, profile) == 0.0
+        
+        ProfileSkill.objects.create(
+            profile=profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        profile.refresh_from_db()
+        
+        assert cached_match_score(job, profile) == calculate_match_score(job, profile) > 0
+    
+    def test_cached_match_score_expires_on_job_skill_change(self, job, job_seeker_user, skill):
+        """Test cached scores are recomputed after the job's skills change"""
+        profile = job_seeker_user.profile
+        ProfileSkill.objects.create(
+            profile=profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        profile.refresh_from_db()
+        before = cached_match_score(job, profile)
+        
+        job.skills_required.add(Skill.objects.create(name='Rust'))
+        
+        after = cached_match_score(job, profile)
+        assert after == calculate_match_score(job, profile) < before
+    
+    def test_matching_jobs_view_is_paginated(self, job, job_seeker_user, skill):
+        """Test the matching jobs endpoint pages through ranked jobs with limit/offset"""
+        ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.get('/api/matching/jobs/', {'limit': 1})
+        assert response.status_code == 200
+        assert response.data['total_matches'] == 1
+        assert response.data['next'] is None
+        assert [j['id'] for j in response.data['jobs']] == [job.id]
+        assert response.data['jobs'][0]['match_score'] > 0.8
+        
+        response = client.get('/api/matching/jobs/', {'limit': 1, 'offset': 1})
+        assert response.data['jobs'] == []
+    
+    def test_candidates_view_serves_precomputed_matches(self, job, job_seeker_user, employer_user, skill):
+        """Test recompute_top_matches fills MatchCache and the candidates endpoint reads it"""
+        ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        assert recompute_top_matches(job.id) == 1
+        
+        # Change the cached score so the response shows where it came from
+        MatchCache.objects.filter(job=job).update(score=0.5)
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        response = client.get(f'/api/matching/candidates/{job.id}/')
+        assert response.status_code == 200
+        assert response.data['total_matches'] == 1
+        assert response.data['candidates'][0]['match_score'] == 0.5
+        
+        # Saving the job drops its cache, so live scores are served again
+        job.save()
+        response = client.get(f'/api/matching/candidates/{job.id}/')
+        assert response.data['candidates'][0]['match_score'] > 0.8
+    
+    def test_precomputed_matches_follow_profile_changes(self, job, job_seeker_user, employer_user, skill):
+        """Test cached candidates drop private profiles and survive logins, but not skill changes"""
+        profile_skill = ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        recompute_top_matches(job.id)
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        # Hidden without a save, as a queryset update would do
+        Profile.objects.filter(pk=job_seeker_user.profile.pk).update(is_public=False)
+        response = client.get(f'/api/matching/candidates/{job.id}/')
+        assert response.data['total_matches'] == 0
+        
+        # Saving the profile, as every login does through the user, keeps the cache
+        Profile.objects.filter(pk=job_seeker_user.profile.pk).update(is_public=True)
+        response = APIClient().post('/api/auth/token/', {'email': job_seeker_user.email, 'password': 'testpass123'})
+        assert response.status_code == 200
+        assert MatchCache.objects.filter(profile=job_seeker_user.profile).exists()
+        
+        profile_skill.delete()
+        assert not MatchCache.objects.filter(profile=job_seeker_user.profile).exists()
+    
+    def test_score_and_save_applications(self, job, job_seeker_user, skill):
+        """Test batch scoring stores the same score as calculate_match_score"""
+        profile = job_seeker_user.profile
+        ProfileSkill.objects.create(
+            profile=profile,
+            skill=skill,
+            level='advanced',
+            years_experience=4
+        )
+        application = Application.objects.create(job=job, applicant=job_seeker_user, match_score=0.0)
+        
+        assert score_and_save_applications(job, Application.objects.filter(job=job)) == 1
+        application.refresh_from_db()
+        assert application.match_score == calculate_match_score(job, profile)
+    
+    def test_candidates_view_query_count(self, job, job_seeker_user, employer_user, skill, django_assert_num_queries):
+        """Test the candidates endpoint serializes a page without per-profile queries"""
+        ProfileSkill.objects.create(
+            profile=job_seeker_user.profile,
+            skill=skill,
+            level='expert',
+            years_experience=10
+        )
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        with django_assert_num_queries(9):
+            response = client.get(f'/api/matching/candidates/{job.id}/')
+        assert response.data['candidates'][0]['skills'][0]['skill']['name'] == 'Python'
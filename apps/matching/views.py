@@ -1,6 +1,7 @@
 """
 Views for matching app
 """
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -9,11 +10,14 @@ from apps.jobs.models import Job
 from apps.jobs.serializers import JobSerializer
 from apps.profiles.models import Profile
 from apps.profiles.serializers import ProfileSerializer
+from .pagination import MatchPagination
+from .tasks import recompute_top_matches
 from .services import (
-    find_matching_candidates,
-    find_matching_jobs,
+    cached_candidates_queryset,
+    matching_candidates_queryset,
+    matching_jobs_queryset,
     get_skill_gap_analysis,
-    calculate_match_score,
+    cached_match_score,
 )
 
 
@@ -44,24 +48,31 @@ class MatchingCandidatesView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get parameters
-        limit = int(request.query_params.get('limit', 50))
+        # Get parameters (limit/offset are read by the paginator)
         min_score = float(request.query_params.get('min_score', 0.3))
         
-        # Find matching candidates
-        matches = find_matching_candidates(job, limit=limit, min_score=min_score)
+        # Serve precomputed matches when fresh; otherwise score live and queue a refresh
+        queryset = cached_candidates_queryset(job, min_score=min_score)
+        if queryset is None:
+            queryset = matching_candidates_queryset(job, min_score=min_score)
+            if getattr(settings, 'CELERY_BROKER_URL', None):
+                recompute_top_matches.delay(job.id)
+        
+        # Only the requested page is loaded; ProfileSerializer batches its relations
+        paginator = MatchPagination()
+        profiles = paginator.paginate_queryset(queryset.select_related('user'), request, view=self)
         
         # Format response
-        results = []
-        for profile, score in matches:
-            profile_data = ProfileSerializer(profile).data
-            profile_data['match_score'] = score
-            results.append(profile_data)
+        results = ProfileSerializer(profiles, many=True).data
+        for profile, profile_data in zip(profiles, results):
+            profile_data['match_score'] = round(profile.score, 3)
         
         return Response({
             'job_id': job_id,
             'job_title': job.title,
-            'total_matches': len(results),
+            'total_matches': paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
             'candidates': results
         })
 
@@ -93,23 +104,27 @@ class MatchingJobsView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Get parameters
-        limit = int(request.query_params.get('limit', 50))
+        # Get parameters (limit/offset are read by the paginator)
         min_score = float(request.query_params.get('min_score', 0.3))
         
-        # Find matching jobs
-        matches = find_matching_jobs(profile, limit=limit, min_score=min_score)
+        # Find matching jobs; only the requested page is loaded, with everything JobSerializer reads
+        paginator = MatchPagination()
+        jobs = paginator.paginate_queryset(
+            matching_jobs_queryset(profile, min_score=min_score).with_user_flags(request.user),
+            request,
+            view=self
+        )
         
         # Format response
-        results = []
-        for job, score in matches:
-            job_data = JobSerializer(job, context={'request': request}).data
-            job_data['match_score'] = score
-            results.append(job_data)
+        results = JobSerializer(jobs, many=True, context={'request': request}).data
+        for job, job_data in zip(jobs, results):
+            job_data['match_score'] = round(job.score, 3)
         
         return Response({
             'profile_id': profile.id,
-            'total_matches': len(results),
+            'total_matches': paginator.count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
             'jobs': results
         })
 
@@ -213,7 +228,7 @@ class CalculateMatchScoreView(APIView):
                 )
         
         # Calculate match score
-        score = calculate_match_score(job, profile)
+        score = cached_match_score(job, profile)
         
         return Response({
             'job_id': job_id,
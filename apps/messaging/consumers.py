@@ -1,14 +1,42 @@
 """
 WebSocket consumers for real-time messaging
 """
-import json
+import uuid
+from collections import defaultdict
+
+import msgspec
+import orjson
 from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
-from .models import Conversation, Message
+from django.db.models import F
+from django.utils import timezone
+from .models import Conversation, ConversationParticipant, Message
 
 User = get_user_model()
 
+# Clients that offer this subprotocol get msgpack binary frames instead of JSON text
+MSGPACK_SUBPROTOCOL = 'msgpack'
+
+_msgpack_encoder = msgspec.msgpack.Encoder()
+_msgpack_decoder = msgspec.msgpack.Decoder()
+
+# Consumers connected to this process, by room group. Messages reach them
+# directly; the channel layer only carries them to other processes
+LOCAL_GROUPS = defaultdict(set)
+
+# Tags group events so this process can skip the ones it already delivered
+_PROCESS_ID = uuid.uuid4().hex
+
+
+class ChatMessageOut(msgspec.Struct):
+    """Chat message payload broadcast to the conversation group"""
+    
+    id: int
+    sender_id: int
+    sender_email: str
+    content: str
+    created_at: str
+
 
 class ChatConsumer(AsyncWebsocketConsumer):
     """WebSocket consumer for real-time chat"""
@@ -37,20 +65,31 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
-        await self.accept()
+        self.use_msgpack = MSGPACK_SUBPROTOCOL in self.scope.get('subprotocols', [])
+        await self.accept(subprotocol=MSGPACK_SUBPROTOCOL if self.use_msgpack else None)
+        LOCAL_GROUPS[self.room_group_name].add(self)
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
+        local_group = LOCAL_GROUPS.get(self.room_group_name)
+        if local_group is not None:
+            local_group.discard(self)
+            if not local_group:
+                del LOCAL_GROUPS[self.room_group_name]
+        
         # Leave room group
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
     
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         """Receive message from WebSocket"""
         try:
-            data = json.loads(text_data)
+            if bytes_data is not None:
+                data = _msgpack_decoder.decode(bytes_data)
+            else:
+                data = orjson.loads(text_data)
             message_type = data.get('type', 'chat_message')
             
             if message_type == 'chat_message':
@@ -62,18 +101,20 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 # Save message to database
                 message = await self.save_message(content)
                 
-                # Send message to room group
+                # Channel layers only carry builtin types
+                payload = msgspec.to_builtins(message)
+                
+                # Deliver to consumers in this process without a channel layer round trip
+                for consumer in list(LOCAL_GROUPS.get(self.room_group_name, ())):
+                    await consumer.send_chat_message(payload)
+                
+                # Send message to room group, for consumers in other processes
                 await self.channel_layer.group_send(
                     self.room_group_name,
                     {
                         'type': 'chat_message',
-                        'message': {
-                            'id': message.id,
-                            'sender_id': message.sender.id,
-                            'sender_email': message.sender.email,
-                            'content': message.content,
-                            'created_at': message.created_at.isoformat(),
-                        }
+                        'message': payload,
+                        'origin': _PROCESS_ID,
                     }
                 )
             
@@ -81,43 +122,64 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 # Mark messages as read
                 await self.mark_messages_read()
         
-        except json.JSONDecodeError:
+        except (orjson.JSONDecodeError, msgspec.DecodeError):
             pass
     
     async def chat_message(self, event):
         """Receive message from room group and send to WebSocket"""
-        await self.send(text_data=json.dumps({
+        if event.get('origin') == _PROCESS_ID:
+            # Already delivered locally by the sending consumer
+            return
+        await self.send_chat_message(event['message'])
+    
+    async def send_chat_message(self, message):
+        """Send a chat message to this WebSocket"""
+        payload = {
             'type': 'chat_message',
-            'message': event['message']
-        }))
+            'message': message
+        }
+        if self.use_msgpack:
+            await self.send(bytes_data=_msgpack_encoder.encode(payload))
+        else:
+            await self.send(text_data=orjson.dumps(payload).decode())
     
-    @database_sync_to_async
-    def check_participant(self):
+    async def check_participant(self):
         """Check if user is participant in conversation"""
-        try:
-            conversation = Conversation.objects.get(id=self.conversation_id)
-            return conversation.participants.filter(id=self.user.id).exists()
-        except Conversation.DoesNotExist:
-            return False
+        return await Conversation.objects.filter(
+            id=self.conversation_id,
+            participants=self.user
+        ).aexists()
     
-    @database_sync_to_async
-    def save_message(self, content):
-        """Save message to database"""
-        conversation = Conversation.objects.get(id=self.conversation_id)
-        message = Message.objects.create(
-            conversation=conversation,
+    async def save_message(self, content):
+        """Save message to database and return its broadcast payload"""
+        message = await Message.objects.acreate(
+            conversation_id=self.conversation_id,
             sender=self.user,
             content=content
         )
-        # Update conversation timestamp
-        conversation.save(update_fields=['updated_at'])
-        return message
+        # Update conversation timestamp without loading the row; update()
+        # skips auto_now, so the value is set explicitly
+        await Conversation.objects.filter(id=self.conversation_id).aupdate(
+            updated_at=timezone.now()
+        )
+        await ConversationParticipant.objects.filter(
+            conversation_id=self.conversation_id
+        ).exclude(user=self.user).aupdate(unread_count=F('unread_count') + 1)
+        return ChatMessageOut(
+            id=message.id,
+            sender_id=self.user.id,
+            sender_email=self.user.email,
+            content=message.content,
+            created_at=message.created_at.isoformat(),
+        )
     
-    @database_sync_to_async
-    def mark_messages_read(self):
+    async def mark_messages_read(self):
         """Mark all messages in conversation as read for this user"""
-        conversation = Conversation.objects.get(id=self.conversation_id)
-        Message.objects.filter(
-            conversation=conversation,
+        await Message.objects.filter(
+            conversation_id=self.conversation_id,
             is_read=False
-        ).exclude(sender=self.user).update(is_read=True)
+        ).exclude(sender=self.user).aupdate(is_read=True)
+        await ConversationParticipant.objects.filter(
+            conversation_id=self.conversation_id,
+            user=self.user
+        ).aupdate(unread_count=0)
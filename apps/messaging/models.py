@@ -8,7 +8,11 @@ from django.conf import settings
 class Conversation(models.Model):
     """Conversation between users"""
     
-    participants = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='conversations')
+    participants = models.ManyToManyField(
+        settings.AUTH_USER_MODEL,
+        through='ConversationParticipant',
+        related_name='conversations'
+    )
     job_context = models.ForeignKey(
         'jobs.Job',
         on_delete=models.SET_NULL,
@@ -29,6 +33,31 @@ class Conversation(models.Model):
         return f"Conversation: {participant_emails}"
 
 
+class ConversationParticipant(models.Model):
+    """A user's membership in a conversation, with their unread message counter"""
+    
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name='memberships'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='conversation_memberships'
+    )
+    # Messages from other participants this user has not read yet; kept in
+    # step with Message.is_read so listing conversations needs no COUNT
+    unread_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'conversation_participants'
+        unique_together = ['conversation', 'user']
+    
+    def __str__(self):
+        return f"{self.user.email} in conversation {self.conversation_id}"
+
+
 class Message(models.Model):
     """Message within a conversation"""
     
@@ -51,6 +80,8 @@ class Message(models.Model):
         # Note: Removed ordering due to djongo/MongoDB limitations with ORDER BY
         indexes = [
             models.Index(fields=['conversation', '-created_at']),
+            # Unread counts and mark-as-read only touch unread rows, usually a small fraction
+            models.Index(fields=['conversation', 'sender'], name='msg_unread_idx', condition=models.Q(is_read=False)),
         ]
     
     def __str__(self):
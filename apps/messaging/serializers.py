@@ -7,12 +7,25 @@ from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# MessageSerializer keys mapped to Message lookups. ConversationViewSet
+# annotates each as last_message_<key> so the list can build last_message
+# without loading message rows
+LAST_MESSAGE_FIELDS = {
+    'id': 'id',
+    'sender': 'sender',
+    'sender_email': 'sender__email',
+    'sender_name': 'sender__display_name',
+    'content': 'content',
+    'is_read': 'is_read',
+    'created_at': 'created_at',
+}
+
 
 class MessageSerializer(serializers.ModelSerializer):
     """Serializer for Message model"""
     
     sender_email = serializers.EmailField(source='sender.email', read_only=True)
-    sender_name = serializers.CharField(source='sender.profile.display_name', read_only=True)
+    sender_name = serializers.CharField(source='sender.display_name', read_only=True)
     
     class Meta:
         model = Message
@@ -38,23 +51,29 @@ class ConversationSerializer(serializers.ModelSerializer):
             {
                 'id': user.id,
                 'email': user.email,
-                'display_name': user.profile.display_name if hasattr(user, 'profile') else user.email
+                'display_name': user.display_name or user.email
             }
             for user in obj.participants.all()
         ]
     
     def get_last_message(self, obj):
         """Get last message in conversation"""
-        last_message = obj.messages.last()
+        if hasattr(obj, 'last_message_id'):
+            if obj.last_message_id is None:
+                return None
+            return {key: getattr(obj, f'last_message_{key}') for key in LAST_MESSAGE_FIELDS}
+        last_message = obj.messages.select_related('sender').order_by('-created_at').first()
         if last_message:
             return MessageSerializer(last_message).data
         return None
     
     def get_unread_count(self, obj):
         """Get unread message count for current user"""
+        if hasattr(obj, 'unread_count'):
+            return obj.unread_count
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return obj.messages.filter(is_read=False).exclude(sender=request.user).count()
+            return obj.memberships.filter(user=request.user).values_list('unread_count', flat=True).first() or 0
         return 0
 
 
@@ -5,11 +5,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Max
+from django.db import transaction
+from django.db.models import F, Count, OuterRef, Subquery
 from django.contrib.auth import get_user_model
 
-from .models import Conversation, Message
+from .models import Conversation, ConversationParticipant, Message
 from .serializers import (
+    LAST_MESSAGE_FIELDS,
     ConversationSerializer,
     ConversationCreateSerializer,
     MessageSerializer,
@@ -27,11 +29,23 @@ class ConversationViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return conversations for current user"""
+        user = self.request.user
+        # The newest message's fields come from correlated subqueries on the
+        # (conversation, -created_at) index rather than prefetching every message
+        last_message = Message.objects.filter(
+            conversation=OuterRef('pk')
+        ).order_by('-created_at', '-id')
+        # unread_count reads the user's own membership row (the join used by
+        # the filter), so the list needs no GROUP BY
         return Conversation.objects.filter(
-            participants=self.request.user
-        ).prefetch_related('participants', 'messages').annotate(
-            last_message_time=Max('messages__created_at')
-        ).order_by('-last_message_time')
+            memberships__user=user
+        ).select_related('job_context').prefetch_related('participants').annotate(
+            **{
+                f'last_message_{key}': Subquery(last_message.values(lookup)[:1])
+                for key, lookup in LAST_MESSAGE_FIELDS.items()
+            },
+            unread_count=F('memberships__unread_count'),
+        ).order_by('-last_message_created_at')
     
     def create(self, request, *args, **kwargs):
         """Create a new conversation"""
@@ -43,20 +57,20 @@ class ConversationViewSet(viewsets.ModelViewSet):
         initial_message = serializer.validated_data.get('initial_message', '')
         
         # Get recipient
-        try:
-            recipient = User.objects.get(id=recipient_id)
-        except User.DoesNotExist:
+        if not User.objects.filter(id=recipient_id).exists():
             return Response(
                 {'error': 'Recipient not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Check if conversation already exists
+        # Check if conversation already exists: only conversations involving
+        # these users are grouped, counting how many of them take part
+        participant_ids = {request.user.id, recipient_id}
         existing_conversation = Conversation.objects.filter(
-            participants=request.user
-        ).filter(
-            participants=recipient
-        ).first()
+            participants__in=participant_ids
+        ).annotate(
+            matched_participants=Count('participants')
+        ).filter(matched_participants=len(participant_ids)).first()
         
         if existing_conversation:
             # Return existing conversation
@@ -66,26 +80,26 @@ class ConversationViewSet(viewsets.ModelViewSet):
             )
             return Response(response_serializer.data)
         
-        # Create new conversation
-        conversation = Conversation.objects.create()
-        conversation.participants.add(request.user, recipient)
-        
         # Add job context if provided
-        if job_id:
-            try:
-                job = Job.objects.get(id=job_id)
-                conversation.job_context = job
-                conversation.save()
-            except Job.DoesNotExist:
-                pass
-        
-        # Create initial message if provided
-        if initial_message:
-            Message.objects.create(
-                conversation=conversation,
-                sender=request.user,
-                content=initial_message
-            )
+        job_context_id = None
+        if job_id and Job.objects.filter(id=job_id).exists():
+            job_context_id = job_id
+        
+        with transaction.atomic():
+            # Create new conversation
+            conversation = Conversation.objects.create(job_context_id=job_context_id)
+            conversation.participants.add(*participant_ids)
+            
+            # Create initial message if provided
+            if initial_message:
+                Message.objects.create(
+                    conversation=conversation,
+                    sender=request.user,
+                    content=initial_message
+                )
+                ConversationParticipant.objects.filter(
+                    conversation=conversation
+                ).exclude(user=request.user).update(unread_count=F('unread_count') + 1)
         
         response_serializer = ConversationSerializer(
             conversation,
@@ -105,16 +119,29 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        messages = conversation.messages.all()
-        serializer = MessageSerializer(messages, many=True)
+        # Plain dicts with MessageSerializer's keys, fetched in one joined
+        # query and evaluated before the read flags change below
+        data = list(conversation.messages.values(
+            'id',
+            'sender',
+            'content',
+            'is_read',
+            'created_at',
+            sender_email=F('sender__email'),
+            sender_name=F('sender__display_name'),
+        ))
         
         # Mark messages as read
         Message.objects.filter(
             conversation=conversation,
             is_read=False
         ).exclude(sender=request.user).update(is_read=True)
+        ConversationParticipant.objects.filter(
+            conversation=conversation,
+            user=request.user
+        ).update(unread_count=0)
         
-        return Response(serializer.data)
+        return Response(data)
     
     @action(detail=True, methods=['post'])
     def send_message(self, request, pk=None):
@@ -135,11 +162,15 @@ class ConversationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        message = Message.objects.create(
-            conversation=conversation,
-            sender=request.user,
-            content=content
-        )
+        with transaction.atomic():
+            message = Message.objects.create(
+                conversation=conversation,
+                sender=request.user,
+                content=content
+            )
+            ConversationParticipant.objects.filter(
+                conversation=conversation
+            ).exclude(user=request.user).update(unread_count=F('unread_count') + 1)
         
         serializer = MessageSerializer(message)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
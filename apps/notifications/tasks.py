@@ -2,22 +2,14 @@
 Celery tasks for notifications
 """
 from celery import shared_task
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
-
-@shared_task
-def send_verification_email(user_id, token):
-    """Send email verification email"""
-    try:
-        user = User.objects.get(id=user_id)
-        verification_url = f"{settings.FRONTEND_URL}/verify-email?token={token}"
-        
-        subject = 'Verify your SkillMatchHub account'
-        message = f"""
+# Fixed email bodies are built once at import; each send only fills in the link
+_VERIFICATION_BODY = """
         Hi,
         
         Thank you for registering with SkillMatchHub!
@@ -31,17 +23,44 @@ def send_verification_email(user_id, token):
         
         Best regards,
         The SkillMatchHub Team
-        """
+        """.format
+
+_PASSWORD_RESET_BODY = """
+        Hi,
+        
+        You requested to reset your password for SkillMatchHub.
+        
+        Click the link below to reset your password:
+        {reset_url}
+        
+        This link will expire in 1 hour.
+        
+        If you didn't request a password reset, please ignore this email.
+        
+        Best regards,
+        The SkillMatchHub Team
+        """.format
+
+
+@shared_task
+def send_verification_email(user_id, token):
+    """Send email verification email"""
+    try:
+        email = User.objects.values_list('email', flat=True).get(id=user_id)
+        verification_url = f"{settings.FRONTEND_URL}/verify-email?token={token}"
+        
+        subject = 'Verify your SkillMatchHub account'
+        message = _VERIFICATION_BODY(verification_url=verification_url)
         
         send_mail(
             subject,
             message,
             settings.DEFAULT_FROM_EMAIL,
-            [user.email],
+            [email],
             fail_silently=False,
         )
         
-        return f"Verification email sent to {user.email}"
+        return f"Verification email sent to {email}"
     except User.DoesNotExist:
         return f"User with id {user_id} not found"
 
@@ -50,35 +69,21 @@ def send_verification_email(user_id, token):
 def send_password_reset_email(user_id, token):
     """Send password reset email"""
     try:
-        user = User.objects.get(id=user_id)
+        email = User.objects.values_list('email', flat=True).get(id=user_id)
         reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
         
         subject = 'Reset your SkillMatchHub password'
-        message = f"""
-        Hi,
-        
-        You requested to reset your password for SkillMatchHub.
-        
-        Click the link below to reset your password:
-        {reset_url}
-        
-        This link will expire in 1 hour.
-        
-        If you didn't request a password reset, please ignore this email.
-        
-        Best regards,
-        The SkillMatchHub Team
-        """
+        message = _PASSWORD_RESET_BODY(reset_url=reset_url)
         
         send_mail(
             subject,
             message,
             settings.DEFAULT_FROM_EMAIL,
-            [user.email],
+            [email],
             fail_silently=False,
         )
         
-        return f"Password reset email sent to {user.email}"
+        return f"Password reset email sent to {email}"
     except User.DoesNotExist:
         return f"User with id {user_id} not found"
 
@@ -89,7 +94,15 @@ def send_application_notification(application_id):
     from apps.jobs.models import Application
     
     try:
-        application = Application.objects.select_related('job__employer', 'applicant').get(id=application_id)
+        application = Application.objects.select_related(
+            'job__employer', 'applicant__profile'
+        ).only(
+            'match_score',
+            'job__title',
+            'job__employer__email',
+            'applicant__email',
+            'applicant__profile__display_name',
+        ).get(id=application_id)
         employer = application.job.employer
         applicant = application.applicant
         
@@ -126,18 +139,20 @@ def send_message_notification(message_id):
     from apps.messaging.models import Message
     
     try:
-        message = Message.objects.select_related('sender', 'conversation').get(id=message_id)
-        conversation = message.conversation
+        message = Message.objects.select_related('sender__profile').get(id=message_id)
         
         # Send to all participants except sender
-        recipients = conversation.participants.exclude(id=message.sender.id)
-        
-        for recipient in recipients:
-            subject = f'New message from {message.sender.profile.display_name}'
-            email_message = f"""
+        recipient_emails = User.objects.filter(
+            conversations__id=message.conversation_id
+        ).exclude(id=message.sender_id).values_list('email', flat=True)
+        
+        # Every recipient gets the same email, so it is rendered once
+        sender_name = message.sender.profile.display_name
+        subject = f'New message from {sender_name}'
+        email_message = f"""
             Hi,
             
-            You have a new message from {message.sender.profile.display_name}:
+            You have a new message from {sender_name}:
             
             "{message.content[:100]}..."
             
@@ -146,14 +161,19 @@ def send_message_notification(message_id):
             Best regards,
             The SkillMatchHub Team
             """
-            
-            send_mail(
-                subject,
-                email_message,
-                settings.DEFAULT_FROM_EMAIL,
-                [recipient.email],
-                fail_silently=False,
-            )
+        
+        # One SMTP connection for all recipients
+        with get_connection(fail_silently=False) as connection:
+            connection.send_messages([
+                EmailMessage(
+                    subject,
+                    email_message,
+                    settings.DEFAULT_FROM_EMAIL,
+                    [email],
+                    connection=connection,
+                )
+                for email in recipient_emails
+            ])
         
         return f"Message notifications sent for message {message_id}"
     except Message.DoesNotExist:
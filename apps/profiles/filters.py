@@ -0,0 +1,21 @@
+"""
+Filters for profiles app
+"""
+from django_filters import rest_framework as django_filters
+from .models import Profile, Skill
+
+
+class ProfileFilter(django_filters.FilterSet):
+    """Filter profiles by location and availability"""
+    
+    class Meta:
+        model = Profile
+        fields = ['location', 'is_available']
+
+
+class SkillFilter(django_filters.FilterSet):
+    """Filter skills by category"""
+    
+    class Meta:
+        model = Skill
+        fields = ['category']
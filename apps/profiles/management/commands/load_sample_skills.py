@@ -84,17 +84,17 @@ class Command(BaseCommand):
             {'name': 'Agile/Scrum', 'category': 'Soft Skills'},
         ]
 
-        created_count = 0
-        for skill_data in skills_data:
-            skill, created = Skill.objects.get_or_create(
-                name=skill_data['name'],
-                defaults={'category': skill_data['category']}
-            )
-            if created:
-                created_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f'Created skill: {skill.name}')
-                )
+        names = [skill_data['name'] for skill_data in skills_data]
+        existing = set(Skill.objects.filter(name__in=names).values_list('name', flat=True))
+        created_count = len(skills_data) - len(existing)
+
+        # One INSERT ... ON CONFLICT for the whole seed
+        Skill.objects.bulk_create_with_slugs(
+            [Skill(name=skill_data['name'], category=skill_data['category']) for skill_data in skills_data],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['category'],
+        )
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certification',
+            index=models.Index(fields=['profile', 'expiry_date'], name='cert_profile_expiry_idx'),
+        ),
+    ]
@@ -2,10 +2,32 @@
 Profile-related models for SkillMatchHub
 """
 from django.db import models
+from django.db.models.functions import Now, TruncDate
 from django.conf import settings
 from django.utils.text import slugify
 
 
+class SkillQuerySet(models.QuerySet):
+    """QuerySet for Skill"""
+    
+    def bulk_create_with_slugs(self, skills, **kwargs):
+        """bulk_create skills, filling in the slugs Skill.save() would have set
+        
+        Names that slugify to the same value (C++ and C#) get numbered slugs.
+        Extra keyword arguments are passed on to bulk_create.
+        """
+        seen_slugs = set()
+        for skill in skills:
+            slug = base_slug = skill.slug or slugify(skill.name)
+            suffix = 2
+            while slug in seen_slugs:
+                slug = f'{base_slug}-{suffix}'
+                suffix += 1
+            seen_slugs.add(slug)
+            skill.slug = slug
+        return self.bulk_create(skills, **kwargs)
+
+
 class Skill(models.Model):
     """Model for skills taxonomy"""
     
@@ -15,6 +37,8 @@ class Skill(models.Model):
     category = models.CharField(max_length=100, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = SkillQuerySet.as_manager()
+    
     class Meta:
         db_table = 'skills'
         # Note: Removed ordering due to djongo/MongoDB limitations with ORDER BY
@@ -157,6 +181,20 @@ class Education(models.Model):
         return f"{self.degree} in {self.field_of_study} from {self.institution}"
 
 
+class CertificationQuerySet(models.QuerySet):
+    """QuerySet for Certification"""
+    
+    def with_is_expired(self):
+        """Annotate whether each certification's expiry date has passed, evaluated by the database"""
+        return self.annotate(
+            is_expired=models.Case(
+                models.When(expiry_date__lt=TruncDate(Now()), then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField()
+            )
+        )
+
+
 class Certification(models.Model):
     """Certification model"""
     
@@ -170,9 +208,14 @@ class Certification(models.Model):
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = CertificationQuerySet.as_manager()
+    
     class Meta:
         db_table = 'certifications'
         # Note: Removed ordering due to djongo/MongoDB limitations with ORDER BY
+        indexes = [
+            models.Index(fields=['profile', 'expiry_date'], name='cert_profile_expiry_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.issuing_organization}"
@@ -1,11 +1,36 @@
 """
 Serializers for profiles app
 """
+import copy
+
+from django.db import models
+from django.db.models import Prefetch, prefetch_related_objects
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Profile, Skill, ProfileSkill, Experience, Education, Certification
 
 
-class SkillSerializer(serializers.ModelSerializer):
+class CachedFieldsSerializerMixin:
+    """Build a serializer class's fields once and give each instance shallow copies
+    
+    ModelSerializer introspects the model and deep-copies every declared field
+    each time it is instantiated, which nested list responses do per row. The
+    fields here don't depend on the instance or context, so that work is shared.
+    Nested many=True fields also share their child serializer, so nested
+    representations must not rely on the request context.
+    """
+    
+    _fields_cache = {}
+    
+    def get_fields(self):
+        """Return copies of the fields built for this class"""
+        cls = type(self)
+        if cls not in self._fields_cache:
+            self._fields_cache[cls] = super().get_fields()
+        return {name: copy.copy(field) for name, field in self._fields_cache[cls].items()}
+
+
+class SkillSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for Skill model"""
     
     class Meta:
@@ -14,10 +39,10 @@ class SkillSerializer(serializers.ModelSerializer):
         read_only_fields = ('slug',)
 
 
-class ProfileSkillSerializer(serializers.ModelSerializer):
+class ProfileSkillSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for ProfileSkill model"""
     
-    skill = serializers.SerializerMethodField()
+    skill = SkillSerializer(read_only=True)
     skill_id = serializers.PrimaryKeyRelatedField(
         queryset=Skill.objects.all(),
         source='skill',
@@ -27,19 +52,9 @@ class ProfileSkillSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProfileSkill
         fields = ('id', 'skill', 'skill_id', 'level', 'years_experience', 'is_verified')
-    
-    def get_skill(self, obj):
-        """Get skill data with djongo-compatible query"""
-        try:
-            if obj.skill_id:
-                skill = Skill.objects.get(id=obj.skill_id)
-                return SkillSerializer(skill).data
-            return None
-        except Exception:
-            return None
 
 
-class ExperienceSerializer(serializers.ModelSerializer):
+class ExperienceSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for Experience model"""
     
     class Meta:
@@ -50,7 +65,7 @@ class ExperienceSerializer(serializers.ModelSerializer):
         )
 
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for Education model"""
     
     class Meta:
@@ -61,26 +76,64 @@ class EducationSerializer(serializers.ModelSerializer):
         )
 
 
-class CertificationSerializer(serializers.ModelSerializer):
+class CertificationSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for Certification model"""
     
+    is_expired = serializers.SerializerMethodField()
+    
     class Meta:
         model = Certification
         fields = (
             'id', 'name', 'issuing_organization', 'issue_date',
-            'expiry_date', 'credential_id', 'credential_url', 'is_verified'
+            'expiry_date', 'credential_id', 'credential_url', 'is_verified', 'is_expired'
         )
+    
+    def get_is_expired(self, obj):
+        """Whether the certification has expired, from the with_is_expired() annotation when present"""
+        if hasattr(obj, 'is_expired'):
+            return obj.is_expired
+        return obj.expiry_date is not None and obj.expiry_date < timezone.localdate()
+
 
+# Related rows ProfileSerializer reads for each profile, limited to the
+# columns the nested serializers emit (plus profile_id to group them)
+PROFILE_CHILD_PREFETCHES = (
+    Prefetch('profileskill_set', queryset=ProfileSkill.objects.select_related('skill').only(
+        'profile_id', 'level', 'years_experience', 'is_verified',
+        *(f'skill__{field}' for field in SkillSerializer.Meta.fields)
+    )),
+    Prefetch('experiences', queryset=Experience.objects.only('profile_id', *ExperienceSerializer.Meta.fields)),
+    Prefetch('education', queryset=Education.objects.only('profile_id', *EducationSerializer.Meta.fields)),
+    Prefetch('certifications', queryset=Certification.objects.with_is_expired().only(
+        'profile_id', *(field for field in CertificationSerializer.Meta.fields if field != 'is_expired')
+    )),
+)
 
-class ProfileSerializer(serializers.ModelSerializer):
+
+class ProfileListSerializer(serializers.ListSerializer):
+    """Load the related rows for every profile in the list before serializing
+    
+    Each relation is fetched with one profile_id__in query for the whole list;
+    relations the caller already selected or prefetched are left as they are.
+    """
+    
+    def to_representation(self, data):
+        profiles = list(data.all() if isinstance(data, models.Manager) else data)
+        prefetch_related_objects(profiles, 'user', *PROFILE_CHILD_PREFETCHES)
+        return super().to_representation(profiles)
+
+
+class ProfileSerializer(CachedFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for Profile model"""
     
     user_email = serializers.EmailField(source='user.email', read_only=True)
     user_type = serializers.CharField(source='user.user_type', read_only=True)
-    skills = serializers.SerializerMethodField()
-    experiences = serializers.SerializerMethodField()
-    education = serializers.SerializerMethodField()
-    certifications = serializers.SerializerMethodField()
+    # Each nested list serializer is built once with the parent's fields and
+    # reused for every profile; the related managers read prefetched rows
+    skills = ProfileSkillSerializer(source='profileskill_set', many=True, read_only=True)
+    experiences = ExperienceSerializer(many=True, read_only=True)
+    education = EducationSerializer(many=True, read_only=True)
+    certifications = CertificationSerializer(many=True, read_only=True)
     
     class Meta:
         model = Profile
@@ -92,38 +145,16 @@ class ProfileSerializer(serializers.ModelSerializer):
             'is_public', 'is_available', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'created_at', 'updated_at')
+        list_serializer_class = ProfileListSerializer
+
+
+class ProfileSummarySerializer(serializers.ModelSerializer):
+    """Serializer for the fields shown when listing profiles"""
     
-    def get_skills(self, obj):
-        """Get skills with djongo-compatible query"""
-        try:
-            profile_skills = list(ProfileSkill.objects.filter(profile_id=obj.id).order_by())
-            return ProfileSkillSerializer(profile_skills, many=True).data
-        except Exception:
-            return []
-    
-    def get_experiences(self, obj):
-        """Get experiences with djongo-compatible query"""
-        try:
-            experiences = list(Experience.objects.filter(profile_id=obj.id).order_by())
-            return ExperienceSerializer(experiences, many=True).data
-        except Exception:
-            return []
-    
-    def get_education(self, obj):
-        """Get education with djongo-compatible query"""
-        try:
-            education = list(Education.objects.filter(profile_id=obj.id).order_by())
-            return EducationSerializer(education, many=True).data
-        except Exception:
-            return []
-    
-    def get_certifications(self, obj):
-        """Get certifications with djongo-compatible query"""
-        try:
-            certifications = list(Certification.objects.filter(profile_id=obj.id).order_by())
-            return CertificationSerializer(certifications, many=True).data
-        except Exception:
-            return []
+    class Meta:
+        model = Profile
+        fields = ('id', 'display_name', 'headline', 'location', 'avatar', 'is_available')
+        read_only_fields = fields
 
 
 class ProfileCreateUpdateSerializer(serializers.ModelSerializer):
@@ -1,10 +1,11 @@
 """
 Signal handlers for profiles app
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Profile
+from django.utils import timezone
+from .models import Profile, ProfileSkill
 
 User = get_user_model()
 
@@ -24,3 +25,21 @@ def save_user_profile(sender, instance, **kwargs):
     """Save profile when user is saved"""
     if hasattr(instance, 'profile'):
         instance.profile.save()
+
+
+@receiver(post_save, sender=ProfileSkill)
+@receiver(post_delete, sender=ProfileSkill)
+def touch_profile_on_skill_change(sender, instance, **kwargs):
+    """Bump profile.updated_at so cached match scores for it expire"""
+    Profile.objects.filter(pk=instance.profile_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Profile)
+def sync_user_display_name(sender, instance, **kwargs):
+    """Copy display_name onto the user row it is denormalized to"""
+    User.objects.filter(pk=instance.user_id).exclude(
+        display_name=instance.display_name
+    ).update(display_name=instance.display_name)
+    if Profile.user.is_cached(instance):
+        # Also refresh the User object the caller is holding
+        instance.user.display_name = instance.display_name
@@ -0,0 +1,195 @@
+"""
+Tests for profiles app
+"""
+import pytest
+from rest_framework.test import APIClient
+from apps.profiles.models import Profile, Skill, ProfileSkill, Experience, Education, Certification
+from apps.profiles.serializers import ProfileSerializer
+
+
+@pytest.fixture
+def filled_profile(job_seeker_user, skill):
+    """Give the job seeker's profile one of each nested object"""
+    profile = job_seeker_user.profile
+    ProfileSkill.objects.create(profile=profile, skill=skill, level='advanced', years_experience=3)
+    Experience.objects.create(
+        profile=profile,
+        company_name='Acme',
+        job_title='Developer',
+        employment_type='full_time',
+        start_date='2020-01-01'
+    )
+    Education.objects.create(
+        profile=profile,
+        institution='State University',
+        degree='bachelor',
+        field_of_study='Computer Science',
+        start_date='2015-09-01'
+    )
+    Certification.objects.create(
+        profile=profile,
+        name='Cloud Practitioner',
+        issuing_organization='AWS',
+        issue_date='2022-05-01'
+    )
+    return profile
+
+
+@pytest.mark.django_db
+class TestProfileViewSet:
+    """Test profile endpoints"""
+    
+    def test_list_query_count(self, filled_profile, employer_user, django_assert_num_queries):
+        """Test listing profiles is a single query with the summary fields only"""
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        with django_assert_num_queries(1):
+            response = client.get('/api/profiles/')
+        
+        assert response.status_code == 200
+        data = {profile['id']: profile for profile in response.data}
+        assert data[filled_profile.id] == {
+            'id': filled_profile.id,
+            'display_name': filled_profile.display_name,
+            'headline': filled_profile.headline,
+            'location': filled_profile.location,
+            'avatar': None,
+            'is_available': True,
+        }
+    
+    def test_list_applies_filters(self, job_seeker_user, employer_user):
+        """Test the list endpoint honours filterset and search parameters"""
+        Profile.objects.filter(user=employer_user).update(is_available=False)
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        response = client.get('/api/profiles/', {'is_available': 'false'})
+        assert [profile['id'] for profile in response.data] == [employer_user.profile.id]
+        
+        response = client.get('/api/profiles/', {'search': 'jobseeker'})
+        assert [profile['id'] for profile in response.data] == [job_seeker_user.profile.id]
+    
+    def test_retrieve_includes_nested_objects(self, filled_profile, employer_user, django_assert_num_queries):
+        """Test the detail endpoint returns the full profile without deferred field loads"""
+        client = APIClient()
+        client.force_authenticate(user=employer_user)
+        
+        # profile with user, then one query per nested relation
+        with django_assert_num_queries(5):
+            response = client.get(f'/api/profiles/{filled_profile.id}/')
+        
+        assert response.status_code == 200
+        assert response.data['user_email'] == filled_profile.user.email
+        assert response.data['skills'][0]['skill']['name'] == 'Python'
+        assert response.data['experiences'][0]['company_name'] == 'Acme'
+        assert response.data['education'][0]['institution'] == 'State University'
+        assert response.data['certifications'][0]['name'] == 'Cloud Practitioner'
+    
+    def test_profile_skills_list_query_count(self, filled_profile, skill, django_assert_num_queries):
+        """Test listing profile skills joins the skill instead of fetching it per row"""
+        ProfileSkill.objects.create(profile=filled_profile, skill=Skill.objects.create(name='Django'))
+        client = APIClient()
+        client.force_authenticate(user=filled_profile.user)
+        
+        with django_assert_num_queries(1):
+            response = client.get('/api/profiles/profile-skills/')
+        
+        assert response.status_code == 200
+        assert sorted(item['skill']['name'] for item in response.data) == ['Django', 'Python']
+    
+    def test_create_experience_for_own_profile(self, job_seeker_user):
+        """Test nested objects are created on the current user's profile"""
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.post('/api/profiles/experiences/', {
+            'company_name': 'Initech',
+            'job_title': 'Engineer',
+            'employment_type': 'full_time',
+            'start_date': '2021-03-01'
+        })
+        
+        assert response.status_code == 201
+        assert Experience.objects.get(id=response.data['id']).profile_id == job_seeker_user.profile.id
+    
+    def test_certifications_flag_expired(self, filled_profile):
+        """Test certifications report whether their expiry date has passed"""
+        Certification.objects.create(
+            profile=filled_profile,
+            name='Old Cert',
+            issuing_organization='Vendor',
+            issue_date='2015-01-01',
+            expiry_date='2018-01-01'
+        )
+        Certification.objects.create(
+            profile=filled_profile,
+            name='Future Cert',
+            issuing_organization='Vendor',
+            issue_date='2020-01-01',
+            expiry_date='2999-01-01'
+        )
+        client = APIClient()
+        client.force_authenticate(user=filled_profile.user)
+        
+        response = client.get('/api/profiles/certifications/')
+        assert {item['name']: item['is_expired'] for item in response.data} == {
+            'Cloud Practitioner': False,
+            'Old Cert': True,
+            'Future Cert': False,
+        }
+        
+        response = client.get(f'/api/profiles/{filled_profile.id}/')
+        assert {item['name']: item['is_expired'] for item in response.data['certifications']} == {
+            'Cloud Practitioner': False,
+            'Old Cert': True,
+            'Future Cert': False,
+        }
+
+
+@pytest.mark.django_db
+class TestProfileListSerializer:
+    """Test serializing many profiles at once"""
+    
+    def test_batches_related_rows(self, filled_profile, employer_user, django_assert_num_queries):
+        """Test related rows are loaded once for the whole list"""
+        profiles = list(Profile.objects.all())
+        
+        # user, profile skills joined to skills, experiences, education, certifications
+        with django_assert_num_queries(5):
+            data = ProfileSerializer(profiles, many=True).data
+        
+        assert len(data) == 2
+        profile_data = next(item for item in data if item['id'] == filled_profile.id)
+        assert profile_data['user_email'] == filled_profile.user.email
+        assert profile_data['skills'][0]['skill']['name'] == 'Python'
+
+
+
+@pytest.mark.django_db
+class TestSkillViewSet:
+    """Test skill endpoints"""
+    
+    def test_list_applies_filters(self, skill, job_seeker_user):
+        """Test the list endpoint honours filterset and search parameters"""
+        Skill.objects.create(name='Leadership', category='Soft Skills', description='Leading teams')
+        client = APIClient()
+        client.force_authenticate(user=job_seeker_user)
+        
+        response = client.get('/api/profiles/skills/', {'category': 'Soft Skills'})
+        assert [item['name'] for item in response.data] == ['Leadership']
+        
+        response = client.get('/api/profiles/skills/', {'search': 'python'})
+        assert [item['name'] for item in response.data] == ['Python']
+
+
+@pytest.mark.django_db
+class TestSkillQuerySet:
+    """Test Skill queryset helpers"""
+    
+    def test_bulk_create_with_slugs(self):
+        """Test bulk created skills get unique slugs"""
+        Skill.objects.bulk_create_with_slugs([Skill(name='Machine Learning'), Skill(name='C++'), Skill(name='C#')])
+        
+        slugs = dict(Skill.objects.values_list('name', 'slug'))
+        assert slugs == {'Machine Learning': 'machine-learning', 'C++': 'c', 'C#': 'c-2'}
@@ -5,11 +5,17 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import BrowsableAPIRenderer
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
 
+from config.renderers import ORJSONRenderer
+from .filters import ProfileFilter, SkillFilter
 from .models import Profile, Skill, ProfileSkill, Experience, Education, Certification
 from .serializers import (
+    PROFILE_CHILD_PREFETCHES,
     ProfileSerializer,
+    ProfileSummarySerializer,
     ProfileCreateUpdateSerializer,
     SkillSerializer,
     ProfileSkillSerializer,
@@ -19,14 +25,24 @@ from .serializers import (
 )
 
 
+# The browsable API builds forms (and queries for their choices) whenever a
+# browser asks for HTML, so outside development these endpoints only speak JSON
+PROFILE_RENDERER_CLASSES = [ORJSONRenderer, BrowsableAPIRenderer] if settings.DEBUG else [ORJSONRenderer]
+
+
+def current_profile_id(user):
+    """Id of the user's profile, without loading the rest of the row"""
+    return Profile.objects.values_list('id', flat=True).get(user=user)
+
+
 class ProfileViewSet(viewsets.ModelViewSet):
     """ViewSet for Profile model"""
     
-    # Note: Removed select_related and prefetch_related due to djongo/MongoDB limitations
     queryset = Profile.objects.all()
     permission_classes = [IsAuthenticated]
+    renderer_classes = PROFILE_RENDERER_CLASSES
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['location', 'is_available']
+    filterset_class = ProfileFilter
     search_fields = ['display_name', 'bio', 'headline', 'company_name']
     pagination_class = None  # Disable pagination for djongo compatibility
     # Note: Removed OrderingFilter due to djongo/MongoDB limitations
@@ -35,24 +51,37 @@ class ProfileViewSet(viewsets.ModelViewSet):
         """Use different serializers for different actions"""
         if self.action in ['create', 'update', 'partial_update']:
             return ProfileCreateUpdateSerializer
+        if self.action == 'list':
+            return ProfileSummarySerializer
         return ProfileSerializer
     
     def get_queryset(self):
         """Filter queryset based on user permissions"""
         if self.action == 'list':
-            # Only show public profiles or user's own profile, clear ordering
+            # Only show public profiles or user's own profile, clear ordering.
+            # list() reads plain rows, so nothing is prefetched here
             return self.queryset.filter(is_public=True).order_by()
-        return self.queryset.order_by()
+        # Load everything ProfileSerializer reads up front
+        return self.queryset.select_related('user').prefetch_related(*PROFILE_CHILD_PREFETCHES).order_by()
     
     def list(self, request, *args, **kwargs):
-        """Override list to handle djongo compatibility"""
-        try:
-            queryset = self.get_queryset().order_by()
-            profiles = list(queryset)
-            serializer = self.get_serializer(profiles, many=True)
-            return Response(serializer.data)
-        except Exception as e:
-            return Response([], status=status.HTTP_200_OK)
+        """List profiles as plain dicts in ProfileSummarySerializer's shape
+        
+        Rows come straight from values(), so no model instances or
+        serializer fields are built per profile.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        data = list(queryset.values(*ProfileSummarySerializer.Meta.fields))
+        for item in data:
+            item['avatar'] = self._file_url('avatar', item['avatar'])
+        return Response(data)
+    
+    def _file_url(self, field_name, name):
+        """Absolute URL for a stored file name, as DRF's FileField renders it"""
+        if not name:
+            return None
+        url = Profile._meta.get_field(field_name).storage.url(name)
+        return self.request.build_absolute_uri(url)
     
     @action(detail=False, methods=['get', 'put', 'patch'])
     def me(self, request):
@@ -83,8 +112,9 @@ class SkillViewSet(viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = PROFILE_RENDERER_CLASSES
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ['category']
+    filterset_class = SkillFilter
     search_fields = ['name', 'description']
     pagination_class = None  # Disable pagination for djongo compatibility
     # Note: Removed OrderingFilter due to djongo/MongoDB limitations
@@ -96,7 +126,7 @@ class SkillViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         """Override list to handle djongo compatibility"""
         try:
-            queryset = self.get_queryset().order_by()
+            queryset = self.filter_queryset(self.get_queryset())
             skills = list(queryset)
             serializer = self.get_serializer(skills, many=True)
             return Response(serializer.data)
@@ -109,12 +139,13 @@ class ProfileSkillViewSet(viewsets.ModelViewSet):
     
     serializer_class = ProfileSkillSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = PROFILE_RENDERER_CLASSES
     pagination_class = None  # Disable pagination for djongo compatibility
     
     def get_queryset(self):
         """Return profile skills for the current user's profile"""
-        # Note: Removed select_related due to djongo/MongoDB limitations
-        return ProfileSkill.objects.filter(profile__user=self.request.user).order_by()
+        # The nested skill is read for every row, so join it in
+        return ProfileSkill.objects.filter(profile__user=self.request.user).select_related('skill').order_by()
     
     def list(self, request, *args, **kwargs):
         """Override list to handle djongo compatibility"""
@@ -128,7 +159,7 @@ class ProfileSkillViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Create a profile skill for the current user's profile"""
-        serializer.save(profile=self.request.user.profile)
+        serializer.save(profile_id=current_profile_id(self.request.user))
 
 
 class ExperienceViewSet(viewsets.ModelViewSet):
@@ -136,6 +167,7 @@ class ExperienceViewSet(viewsets.ModelViewSet):
     
     serializer_class = ExperienceSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = PROFILE_RENDERER_CLASSES
     pagination_class = None  # Disable pagination for djongo compatibility
     
     def get_queryset(self):
@@ -154,7 +186,7 @@ class ExperienceViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Create an experience for the current user's profile"""
-        serializer.save(profile=self.request.user.profile)
+        serializer.save(profile_id=current_profile_id(self.request.user))
 
 
 class EducationViewSet(viewsets.ModelViewSet):
@@ -162,6 +194,7 @@ class EducationViewSet(viewsets.ModelViewSet):
     
     serializer_class = EducationSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = PROFILE_RENDERER_CLASSES
     pagination_class = None  # Disable pagination for djongo compatibility
     
     def get_queryset(self):
@@ -180,7 +213,7 @@ class EducationViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Create an education entry for the current user's profile"""
-        serializer.save(profile=self.request.user.profile)
+        serializer.save(profile_id=current_profile_id(self.request.user))
 
 
 class CertificationViewSet(viewsets.ModelViewSet):
@@ -188,11 +221,12 @@ class CertificationViewSet(viewsets.ModelViewSet):
     
     serializer_class = CertificationSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = PROFILE_RENDERER_CLASSES
     pagination_class = None  # Disable pagination for djongo compatibility
     
     def get_queryset(self):
         """Return certifications for the current user's profile"""
-        return Certification.objects.filter(profile__user=self.request.user).order_by()
+        return Certification.objects.filter(profile__user=self.request.user).with_is_expired().order_by()
     
     def list(self, request, *args, **kwargs):
         """Override list to handle djongo compatibility"""
@@ -206,4 +240,4 @@ class CertificationViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         """Create a certification for the current user's profile"""
-        serializer.save(profile=self.request.user.profile)
+        serializer.save(profile_id=current_profile_id(self.request.user))
@@ -0,0 +1,39 @@
+"""
+API renderers for SkillMatchHub
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson instead of the stdlib json module"""
+    
+    # Types orjson does not know (Decimal, lazy strings, querysets) go
+    # through DRF's encoder so output matches JSONRenderer
+    encoder = JSONEncoder()
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON bytes"""
+        if data is None:
+            return b''
+        
+        renderer_context = renderer_context or {}
+        option = orjson.OPT_PASSTHROUGH_DATETIME
+        if self.get_indent(accepted_media_type, renderer_context):
+            option |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(data, default=self.encoder.default, option=option)
+
+
+class StreamingJSONRenderer(ORJSONRenderer):
+    """Renders an iterable as a JSON array one item at a time"""
+    
+    def render_iter(self, items, accepted_media_type=None, renderer_context=None):
+        """Yield the encoded array in chunks, so memory use does not grow with the item count"""
+        yield b'['
+        for index, item in enumerate(items):
+            if index:
+                yield b','
+            yield self.render(item, accepted_media_type, renderer_context)
+        yield b']'
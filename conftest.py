@@ -3,12 +3,21 @@ Test configuration and fixtures
 """
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from apps.profiles.models import Profile, Skill
 from apps.jobs.models import Job
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keep cached API responses from leaking between tests"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def job_seeker_user(db):
     """Create a job seeker user"""